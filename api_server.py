@@ -1,41 +1,215 @@
 import asyncio
+import multiprocessing
+import orjson
+import os
+import queue
+import sys
 import uvicorn
 import uuid
 import time
-from fastapi import FastAPI, BackgroundTasks
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
-from typing import Dict, List, Optional, Any
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Dict, List, Optional, Any, Tuple
 
 # Import your existing forecasting machinery
 from src.forecasting_engine import run_full_pipeline
 from src.utils.buffers import BufferManager
+from src.utils import event_loop
+from src.utils.http_client import close_shared_http_client
 from src.utils.buffer_config import get_buffer_names
 from src.ui.cli import init_buffers  # Import the init_buffers function
 
+# In-memory sessions store
+sessions = {}
+
+# Buffer managers of evicted sessions, reset and kept for reuse by new sessions
+BUFFER_MANAGER_POOL = deque(maxlen=64)
+
+def acquire_buffer_manager() -> BufferManager:
+    """Get an empty buffer manager, reusing a pooled one when available"""
+    if BUFFER_MANAGER_POOL:
+        return BUFFER_MANAGER_POOL.popleft()
+    return BufferManager(echo_user=False)
+
+def release_buffer_manager(buffer_manager: BufferManager):
+    """Reset a buffer manager that is no longer used and return it to the pool"""
+    buffer_manager.reset()
+    BUFFER_MANAGER_POOL.append(buffer_manager)
+
+# Forecasts allowed to run at once; later ones wait for a slot
+MAX_CONCURRENT_FORECASTS = int(os.environ.get("MAX_CONCURRENT_FORECASTS", "8"))
+# Forecasts allowed to wait for a slot before new requests are rejected with 429
+MAX_QUEUED_FORECASTS = int(os.environ.get("MAX_QUEUED_FORECASTS", "32"))
+FORECAST_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_FORECASTS)
+forecast_counts = {"running": 0, "queued": 0}
+
+def release_forecast_slot():
+    """Free a running forecast's slot once its worker has returned"""
+    forecast_counts["running"] -= 1
+    FORECAST_SEMAPHORE.release()
+
+# Forecasts run in worker processes so the pipeline never blocks the API event loop.
+# Each process also gets its own copy of the display module's global buffers. Every
+# Uvicorn worker has its own pool and Manager process, so a prod server runs up to
+# WEB_CONCURRENCY x MAX_CONCURRENT_FORECASTS forecast processes.
+_mp_context = multiprocessing.get_context("spawn")
+PIPELINE_POOL = ProcessPoolExecutor(max_workers=MAX_CONCURRENT_FORECASTS, mp_context=_mp_context)
+_queue_manager = None
+
+# Threads that block on worker line queues. A dedicated pool (one reader per running
+# forecast, plus room to deliver the end-of-lines sentinel for a worker that died)
+# so relays never starve each other or the loop's default executor, which also
+# serves DNS lookups.
+RELAY_POOL = ThreadPoolExecutor(max_workers=2 * MAX_CONCURRENT_FORECASTS, thread_name_prefix="buffer-relay")
+
+def get_queue_manager():
+    """Get the manager that creates buffer line queues and cancel events shared with worker processes"""
+    global _queue_manager
+    if _queue_manager is None:
+        _queue_manager = _mp_context.Manager()
+    return _queue_manager
+
+# Optional Redis mirror of session state, so any Uvicorn worker can serve any session.
+# Enabled by setting REDIS_URL; the local sessions dict stays the fast path.
+REDIS_URL = os.environ.get("REDIS_URL")
+REDIS_SESSION_TTL_SECONDS = 86400
+redis_client = None
+if REDIS_URL:
+    import redis.asyncio as aioredis
+    redis_client = aioredis.from_url(REDIS_URL, decode_responses=True)
+
+async def publish_session_state(session_id: str, session: Dict[str, Any]):
+    """Mirror a session's status, result and error to Redis"""
+    if redis_client is None:
+        return
+    key = f"sess:{session_id}"
+    await redis_client.hset(key, mapping={
+        "status": session["status"],
+        "result": orjson.dumps(session["result"]).decode(),
+        "error": session["error"] or "",
+    })
+    await redis_client.expire(key, REDIS_SESSION_TTL_SECONDS)
+
+async def publish_buffer_lines(session_id: str, line_queue: asyncio.Queue):
+    """Append buffer lines to the session's Redis stream in the order they were written"""
+    key = f"sess:{session_id}:buf"
+    while True:
+        item = await line_queue.get()
+        if item is None:
+            break
+        section, line = item
+        await redis_client.xadd(key, {"section": section, "line": line})
+        await redis_client.expire(key, REDIS_SESSION_TTL_SECONDS)
+
+async def load_redis_session(session_id: str) -> Optional[Dict[str, Any]]:
+    """Rebuild a session owned by another worker from Redis, or None if unknown"""
+    if redis_client is None:
+        return None
+    state = await redis_client.hgetall(f"sess:{session_id}")
+    if not state:
+        return None
+    
+    lines = defaultdict(list)
+    for _, fields in await redis_client.xrange(f"sess:{session_id}:buf"):
+        lines[fields["section"]].append(fields["line"])
+    
+    return {
+        "status": state["status"],
+        "result": orjson.loads(state["result"]),
+        "error": state["error"] or None,
+        "buffers": {section: "\n".join(lines[section]) for section in get_buffer_names()},
+    }
+
+# Finished sessions are evicted this long after they were last accessed
+SESSION_TTL_SECONDS = 3600
+# How often the cleanup loop looks for expired sessions
+CLEANUP_INTERVAL_SECONDS = 900
+# How often the event stream checks a running session for new buffer lines; the
+# interval doubles while nothing changes, up to STREAM_MAX_INTERVAL_SECONDS
+STREAM_INTERVAL_SECONDS = 0.2
+STREAM_MAX_INTERVAL_SECONDS = 2.0
+
+def next_stream_interval(interval: float, changed: bool) -> float:
+    """Poll quickly while lines are arriving and back off while the session is idle"""
+    return STREAM_INTERVAL_SECONDS if changed else min(STREAM_MAX_INTERVAL_SECONDS, interval * 2)
+
+def evict_expired_sessions(now: Optional[float] = None) -> int:
+    """Remove finished sessions not accessed within SESSION_TTL_SECONDS; returns how many were removed"""
+    if now is None:
+        now = time.monotonic()
+    # A cancelled session's task runs until its worker stops and may still be relaying
+    # lines into the buffer manager, so it only expires once the task is done
+    expired = [
+        session_id for session_id, session in list(sessions.items())
+        if session["status"] != "running"
+        and (session.get("task") is None or session["task"].done())
+        and now - session["last_touch"] > SESSION_TTL_SECONDS
+    ]
+    for session_id in expired:
+        session = sessions.pop(session_id, None)
+        if session is not None and "buffer_manager" in session:
+            release_buffer_manager(session["buffer_manager"])
+    return len(expired)
+
+async def cleanup_sessions_loop():
+    """Periodically evict expired sessions so memory stays bounded"""
+    while True:
+        await asyncio.sleep(CLEANUP_INTERVAL_SECONDS)
+        evict_expired_sessions()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the session cleanup loop for the lifetime of the server"""
+    cleanup_task = asyncio.create_task(cleanup_sessions_loop())
+    try:
+        yield
+    finally:
+        cleanup_task.cancel()
+        PIPELINE_POOL.shutdown(wait=False, cancel_futures=True)
+        RELAY_POOL.shutdown(wait=False, cancel_futures=True)
+        if _queue_manager is not None:
+            _queue_manager.shutdown()
+
 # Create FastAPI instance
-app = FastAPI(title="AI Superforecaster API")
+app = FastAPI(title="AI Superforecaster API", lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Origins allowed to call the API, comma separated ("*" is for local development only)
+FRONTEND_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("FRONTEND_ORIGIN", "http://localhost:3000").split(",")
+    if origin.strip()
+]
 
-# Add CORS middleware to allow React app to connect
+# Add CORS middleware to allow React app to connect. Explicit origins, methods and
+# headers (and no credentials) let browsers cache preflights for a day instead of
+# sending an OPTIONS request before every poll. The frontend must be able to send
+# If-None-Match and read ETag for conditional buffer polling.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Adjust for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=FRONTEND_ORIGINS,
+    allow_credentials=False,
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["content-type", "if-none-match"],
+    expose_headers=["ETag"],
+    max_age=86400,
 )
 
-# In-memory sessions store
-sessions = {}
-
 # API Models
 class ForecastRequest(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+    
     question: str = Field(description="The forecasting question")
     
-    # Validate that the question is not empty
-    @validator('question')
-    def question_must_not_be_empty(cls, v):
-        if not v or v.strip() == "":
+    # Validate that the question is not empty (whitespace is already stripped)
+    @field_validator('question', mode='after')
+    @classmethod
+    def question_must_not_be_empty(cls, v: str) -> str:
+        if not v:
             raise ValueError("Question cannot be empty")
         return v
 
@@ -53,6 +227,11 @@ class ForecastResponse(BaseModel):
     buffers: Optional[Dict[str, str]] = Field(description="Current buffer contents")
     error: Optional[str] = Field(description="Error message if status is 'error'")
 
+def dump_buffers(session: Dict[str, Any]) -> Dict[str, str]:
+    """Get the current contents of every buffer section of a session"""
+    buffer_manager = session["buffer_manager"]
+    return {section: buffer_manager.dump(section) for section in session["section_names"]}
+
 # Simple input provider for non-interactive API use
 class ApiInputProvider:
     def get_input(self, prompt):
@@ -62,64 +241,228 @@ class ApiInputProvider:
 
 # Endpoint to start a new forecast
 @app.post("/forecast", response_model=SessionResponse)
-async def create_forecast(request: ForecastRequest, background_tasks: BackgroundTasks):
+async def create_forecast(request: ForecastRequest):
     """Start a new forecast session"""
-    session_id = str(uuid.uuid4())
+    if forecast_counts["queued"] >= MAX_QUEUED_FORECASTS:
+        raise HTTPException(status_code=429, detail="Too many forecasts queued, please retry later")
+    
+    session_id = uuid.uuid4().hex
     
-    # Create buffer manager for this session
-    buffer_manager = BufferManager(echo_user=False)
+    # Get a buffer manager for this session
+    buffer_manager = acquire_buffer_manager()
     # Initialize buffers - this is crucial for the forecasting engine
     init_buffers(buffer_manager)
     
-    # Store session info
-    sessions[session_id] = {
+    session = {
         "status": "running",
         "buffer_manager": buffer_manager,
         "result": None,
         "error": None,
+        "last_touch": time.monotonic(),
+        # Section names are fixed once buffers are initialized, so snapshot them for the read endpoints
+        "section_names": tuple(buffer_manager.sections),
     }
+    # Mirror to Redis before storing the session, so a failed write leaves no orphaned session behind
+    try:
+        await publish_session_state(session_id, session)
+    except Exception:
+        release_buffer_manager(buffer_manager)
+        raise
+    
+    # Store session info
+    sessions[session_id] = session
     
-    # Run forecast in background to avoid blocking
-    background_tasks.add_task(
-        run_forecast_background,
-        session_id,
-        request.question,
-        buffer_manager
+    # Run forecast as its own task; the session keeps the handle so it can be cancelled
+    session["task"] = asyncio.create_task(
+        run_forecast_background(session_id, request.question, buffer_manager)
     )
     
     return {"session_id": session_id, "status": "running"}
 
+# Endpoint to cancel a running forecast
+@app.delete("/forecast/{session_id}", response_model=SessionResponse)
+async def cancel_forecast(session_id: str):
+    """Cancel a running forecast session"""
+    if session_id not in sessions:
+        return {"session_id": session_id, "status": "not_found"}
+    
+    session = sessions[session_id]
+    session["last_touch"] = time.monotonic()
+    if session["status"] == "running":
+        session["status"] = "cancelled"
+        session["task"].cancel()
+        session["buffer_manager"].write("user", "Forecast cancelled.")
+    
+    return {"session_id": session_id, "status": session["status"]}
+
+# How often a worker process checks whether its forecast was cancelled
+CANCEL_POLL_SECONDS = 0.5
+
+async def run_until_cancelled(pipeline, cancel_event):
+    """Run a pipeline coroutine, cancelling it once cancel_event is set; returns None if cancelled"""
+    task = asyncio.create_task(pipeline)
+    while not task.done():
+        await asyncio.wait({task}, timeout=CANCEL_POLL_SECONDS)
+        if not task.done() and cancel_event.is_set():
+            task.cancel()
+            await asyncio.wait({task})
+    if task.cancelled():
+        return None
+    return task.result()
+
+async def run_worker_forecast(question: str, buffer_manager: BufferManager, cancel_event):
+    """Run one forecast on a worker's throwaway event loop, closing its HTTP client afterwards"""
+    try:
+        return await run_until_cancelled(
+            run_full_pipeline(question, buffer_manager, ApiInputProvider()), cancel_event
+        )
+    finally:
+        # The client's connections belong to this loop, which ends with the forecast
+        await close_shared_http_client()
+
+def _pipeline_entry(question: str, line_queue, cancel_event) -> Optional[Dict[str, Any]]:
+    """
+    Run the forecasting pipeline inside a worker process.
+    Buffer lines are sent back through line_queue, followed by a None sentinel;
+    setting cancel_event stops the pipeline. Returns the forecast as a dict, or
+    None if there is none (e.g. cancelled).
+    """
+    try:
+        buffer_manager = BufferManager(echo_user=False)
+        buffer_manager.register_observer(
+            lambda section, message, timestamp: line_queue.put((section, message))
+        )
+        init_buffers(buffer_manager)
+        
+        result = event_loop.run(run_worker_forecast(question, buffer_manager, cancel_event))
+        return result.model_dump() if result else None
+    finally:
+        # The sentinel follows every line this forecast queued
+        line_queue.put(None)
+
+def get_line_batch(line_queue) -> List[Optional[Tuple[str, str]]]:
+    """Block for the next buffer line from a worker process, then take any others already waiting"""
+    batch = [line_queue.get()]
+    while batch[-1] is not None:
+        try:
+            batch.append(line_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+async def produce_buffer_lines(line_queue, events: asyncio.Queue):
+    """Move buffer lines from a worker process onto the event loop, one thread hop per batch"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = await loop.run_in_executor(RELAY_POOL, get_line_batch, line_queue)
+        for item in batch:
+            events.put_nowait(item)
+        if batch[-1] is None:
+            return
+
+async def consume_buffer_lines(events: asyncio.Queue, buffer_manager: BufferManager):
+    """Write relayed buffer lines into the session's buffer manager (and so to its observers)"""
+    while True:
+        # Wait only when the queue is empty, then write everything already queued
+        item = await events.get()
+        while True:
+            if item is None:
+                return
+            section, message = item
+            buffer_manager.write(section, message)
+            try:
+                item = events.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+
 # Background task to run the forecast
 async def run_forecast_background(session_id: str, question: str, buffer_manager: BufferManager):
     """Run the forecast in the background"""
-    start_time = time.time()
+    start_time = time.monotonic()
+    
+    # Mirror buffer lines to Redis from a single task so stream order matches write order
+    redis_lines = None
+    if redis_client is not None:
+        redis_lines = asyncio.Queue()
+        buffer_manager.register_observer(
+            lambda section, message, timestamp: redis_lines.put_nowait((section, f"[{timestamp}] {message}"))
+        )
+        redis_publisher = asyncio.create_task(publish_buffer_lines(session_id, redis_lines))
+    
     try:
         # Record the start of forecast processing
         buffer_manager.write("user", f"Starting forecast processing at {time.strftime('%H:%M:%S')}")
         
-        # Non-interactive input provider
-        input_provider = ApiInputProvider()
+        # Wait for a forecast slot so bursts queue instead of overloading the server
+        if FORECAST_SEMAPHORE.locked():
+            buffer_manager.write("user", "Waiting for other forecasts to finish...")
+        forecast_counts["queued"] += 1
+        try:
+            await FORECAST_SEMAPHORE.acquire()
+        finally:
+            forecast_counts["queued"] -= 1
+        
+        loop = asyncio.get_running_loop()
+        forecast_counts["running"] += 1
+        try:
+            # Run the forecasting pipeline in a worker process, relaying its buffer output
+            manager = get_queue_manager()
+            line_queue = manager.Queue()
+            cancel_event = manager.Event()
+            worker = loop.run_in_executor(
+                PIPELINE_POOL, _pipeline_entry, question, line_queue, cancel_event
+            )
+        except BaseException:
+            release_forecast_slot()
+            raise
+        
+        def worker_finished(future):
+            # Only now is the worker free, even if this task was cancelled earlier
+            if future.cancelled() or future.exception() is not None:
+                # The worker may have died (or never started) before sending its sentinel.
+                # Send one from the relay pool, since the put is a blocking call to the
+                # Manager; a duplicate after a worker's own sentinel is never read.
+                sentinel_sent = loop.run_in_executor(RELAY_POOL, line_queue.put, None)
+                sentinel_sent.add_done_callback(lambda _: release_forecast_slot())
+            else:
+                release_forecast_slot()
+        
+        worker.add_done_callback(worker_finished)
         
-        # Run the forecasting pipeline using existing code
-        result = await run_full_pipeline(question, buffer_manager, input_provider)
+        events = asyncio.Queue()
+        relay = asyncio.gather(
+            produce_buffer_lines(line_queue, events),
+            consume_buffer_lines(events, buffer_manager),
+        )
+        try:
+            # Shielded so cancelling this task doesn't abandon the worker's future
+            result = await asyncio.shield(worker)
+        except asyncio.CancelledError:
+            # Ask the worker to stop; it keeps its slot until it has returned
+            cancel_event.set()
+            raise
+        finally:
+            # Relay every line the worker wrote, including any written while it stopped
+            await relay
         
         # Calculate elapsed time
-        elapsed_time = time.time() - start_time
+        elapsed_time = time.monotonic() - start_time
         buffer_manager.write("user", f"Forecast processing completed in {elapsed_time:.2f} seconds")
         
         # Update session with results
         if session_id in sessions:
             sessions[session_id]["status"] = "completed"
             if result:
-                # Convert Pydantic model to dict for JSON serialization
-                sessions[session_id]["result"] = result.model_dump()
+                # Already converted to a dict by the worker process; encode it once for polling
+                sessions[session_id]["result"] = result
+                sessions[session_id]["result_bytes"] = orjson.dumps(result)
             else:
                 sessions[session_id]["status"] = "error"
                 sessions[session_id]["error"] = "Forecast failed to produce a result"
     
     except Exception as e:
         # Calculate elapsed time even for errors
-        elapsed_time = time.time() - start_time
+        elapsed_time = time.monotonic() - start_time
         error_msg = str(e)
         
         # Handle errors
@@ -129,53 +472,196 @@ async def run_forecast_background(session_id: str, question: str, buffer_manager
             
             # Log the error to the buffer
             buffer_manager.write("user", f"Error after {elapsed_time:.2f} seconds: {error_msg}")
+    
+    finally:
+        if redis_lines is not None:
+            redis_lines.put_nowait(None)
+            await redis_publisher
+            if session_id in sessions:
+                await publish_session_state(session_id, sessions[session_id])
 
 # Endpoint to check the status of a forecast
-@app.get("/forecast/{session_id}", response_model=ForecastResponse)
+@app.get("/forecast/{session_id}", responses={200: {"model": ForecastResponse}})
 async def get_forecast(session_id: str):
     """Get the current status and results of a forecast session"""
     if session_id not in sessions:
-        return {
+        remote = await load_redis_session(session_id)
+        if remote is not None:
+            return ORJSONResponse({"session_id": session_id, **remote})
+        return ORJSONResponse({
             "session_id": session_id,
             "status": "not_found",
             "result": None,
             "buffers": None,
             "error": None
-        }
+        })
     
     session = sessions[session_id]
-    buffer_manager = session["buffer_manager"]
+    session["last_touch"] = time.monotonic()
     
     # Get current buffer contents
-    buffers = {}
-    for section in buffer_manager.sections:
-        buffers[section] = buffer_manager.dump(section)
+    buffers = dump_buffers(session)
     
-    return {
+    # Splice the pre-encoded result into the response instead of re-encoding it on every poll
+    payload = orjson.dumps({
         "session_id": session_id,
         "status": session["status"],
-        "result": session["result"],
         "buffers": buffers,
         "error": session["error"]
-    }
+    })
+    result_bytes = session.get("result_bytes", b"null")
+    return Response(payload[:-1] + b',"result":' + result_bytes + b"}", media_type="application/json")
 
 # Endpoint to get just the buffer contents
-@app.get("/forecast/{session_id}/buffers", response_model=BufferContents)
-async def get_buffer_contents(session_id: str):
-    """Get just the current buffer contents for a forecast session"""
+@app.get("/forecast/{session_id}/buffers", responses={200: {"model": BufferContents}})
+async def get_buffer_contents(session_id: str, request: Request):
+    """
+    Get just the current buffer contents for a forecast session
+    
+    Responses carry an ETag of the buffer version; polls sending it back in
+    If-None-Match get an empty 304 while nothing new has been written.
+    """
     if session_id not in sessions:
-        return {"content": {}}
+        remote = await load_redis_session(session_id)
+        if remote is not None:
+            return ORJSONResponse({"content": remote["buffers"]})
+        return ORJSONResponse({"content": {}})
     
     session = sessions[session_id]
-    buffer_manager = session["buffer_manager"]
+    session["last_touch"] = time.monotonic()
+    
+    etag = f'"{session["buffer_manager"].version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
     
     # Get current buffer contents
-    buffers = {}
-    for section in buffer_manager.sections:
-        buffers[section] = buffer_manager.dump(section)
+    buffers = dump_buffers(session)
+    
+    # Returned directly so FastAPI skips validating and re-encoding the buffer text
+    return ORJSONResponse({"content": buffers}, headers={"ETag": etag})
+
+# Endpoint to report forecast load
+@app.get("/metrics")
+async def get_metrics():
+    """Report how many forecasts are running and waiting for a slot"""
+    return {
+        "running": forecast_counts["running"],
+        "queued": forecast_counts["queued"],
+        "max_concurrent": MAX_CONCURRENT_FORECASTS,
+        "max_queued": MAX_QUEUED_FORECASTS,
+        "sessions": len(sessions),
+    }
+
+def sse_event(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format a server-sent event"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {orjson.dumps(data).decode()}\n\n"
+
+# Endpoint to stream buffer updates as they happen
+@app.get("/forecast/{session_id}/stream")
+async def stream_forecast(session_id: str):
+    """
+    Stream new buffer lines for a forecast session as server-sent events.
+    Each event carries only the lines added since the previous one; a final
+    'done' event carries the status, result and error.
+    """
+    async def event_stream():
+        offsets = defaultdict(int)
+        seen_version = None
+        interval = STREAM_INTERVAL_SECONDS
+        while True:
+            session = sessions.get(session_id)
+            if session is None:
+                yield sse_event({"status": "not_found"}, event="done")
+                return
+            
+            session["last_touch"] = time.monotonic()
+            buffer_manager = session["buffer_manager"]
+            # Read the status before the buffers so no lines are missed after completion
+            status = session["status"]
+            
+            # Only scan the sections when something was written since the last check
+            version = buffer_manager.version
+            changed = version != seen_version
+            if changed:
+                seen_version = version
+                for section in session["section_names"]:
+                    lines = buffer_manager.lines_from(section, offsets[section])
+                    if lines:
+                        offsets[section] += len(lines)
+                        yield sse_event({"section": section, "delta": "\n".join(lines)})
+            
+            if status != "running":
+                yield sse_event({"status": status, "result": session["result"], "error": session["error"]},
+                                event="done")
+                return
+            
+            interval = next_stream_interval(interval, changed)
+            await asyncio.sleep(interval)
+    
+    # Sessions owned by another worker are streamed from their Redis stream instead
+    if session_id not in sessions and redis_client is not None:
+        return StreamingResponse(redis_event_stream(session_id), media_type="text/event-stream")
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+async def redis_event_stream(session_id: str):
+    """Server-sent events for a session owned by another worker, read incrementally from Redis"""
+    last_id = None
+    interval = STREAM_INTERVAL_SECONDS
+    while True:
+        state = await redis_client.hgetall(f"sess:{session_id}")
+        if not state:
+            yield sse_event({"status": "not_found"}, event="done")
+            return
+        # The owning worker publishes the final status only after its last buffer line
+        status = state["status"]
+        
+        entries = await redis_client.xrange(f"sess:{session_id}:buf", min=f"({last_id}" if last_id else "-")
+        if entries:
+            last_id = entries[-1][0]
+            lines = defaultdict(list)
+            for _, fields in entries:
+                lines[fields["section"]].append(fields["line"])
+            for section, section_lines in lines.items():
+                yield sse_event({"section": section, "delta": "\n".join(section_lines)})
+        
+        if status != "running":
+            yield sse_event({"status": status, "result": orjson.loads(state["result"]), "error": state["error"] or None},
+                            event="done")
+            return
+        
+        interval = next_stream_interval(interval, bool(entries))
+        await asyncio.sleep(interval)
+
+def get_server_options() -> Dict[str, Any]:
+    """
+    Uvicorn options for the current APP_ENV.
+    
+    "dev" (default) runs one auto-reloading worker. "prod" runs WEB_CONCURRENCY
+    workers (default: one per CPU), which requires REDIS_URL so that every
+    worker can serve every session.
+    """
+    if os.environ.get("APP_ENV", "dev") == "prod":
+        workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+        reload = False
+    else:
+        workers = 1
+        reload = True
     
-    return {"content": buffers}
+    if workers > 1 and not REDIS_URL:
+        raise RuntimeError(
+            f"Running {workers} workers requires REDIS_URL: in-memory sessions are not shared between workers"
+        )
+    return {"workers": workers, "reload": reload}
 
 # Start server when run directly
 if __name__ == "__main__":
-    uvicorn.run("api_server:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    uvicorn.run(
+        "api_server:app",
+        host="0.0.0.0",
+        port=8000,
+        # uvloop and httptools are much faster than the stdlib loop and h11 parser (uvloop has no Windows support)
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        **get_server_options(),
+    ) 
\ No newline at end of file
@@ -20,30 +20,129 @@ Usage:
   python main.py --cli                # Start with command-line interface
   python main.py "What is the probability that X will happen by Y?"  # Run forecast immediately
   python main.py --view-only          # Just show the buffer viewer without running forecast
+  python main.py --no-cache           # Don't reuse cached agent outputs from earlier runs
 
 Commands (during CLI execution):
   /rerun - Start a new forecast
   /view <buffer> - View buffer contents (user, background, parameters, report)
   /gui - Launch the buffer viewer in a separate window
+  /clearcache - Forget cached agent outputs so the next forecast calls the LLM again
+  /nocache - Stop using cached agent outputs and forecasts for the rest of the session
   /quit - Exit the application
 """
 import os
+import re
 import subprocess
 import sys
 import time
 import tkinter as tk
 from tkinter import scrolledtext, simpledialog
 import threading
-import datetime
 import argparse
 import asyncio
-import queue
+from collections import deque
 
 from src.utils.buffers import BufferManager
 from src.forecasting_engine import run_full_pipeline, ConsoleInputProvider
 from src.ui.cli import init_buffers, display_welcome
+from src.utils.agent_cache import set_cache_enabled, clear_cache
+from src.utils import event_loop
 from src.utils.buffer_config import get_buffer_names, get_buffer_description, DEFAULT_BUFFERS
 
+# Delay between buffer flushes to the GUI (~60 frames per second)
+FLUSH_INTERVAL_MS = 16
+
+# Text colors per buffer section
+SECTION_COLORS = {
+    "user": {"fg": "#0078d7", "header_fg": "#005999", "success_fg": "#009900"},  # Blue, darker blue, green
+    "background": {"fg": "#8252c7", "header_fg": "#5a3a8a"},  # Purple, darker purple
+    "parameters": {"fg": "#d75f00", "header_fg": "#a04700", 
+                  "positive_fg": "#007700", "negative_fg": "#cc0000"},  # Orange, darker orange, green, red
+    "report": {"fg": "#007744", "header_fg": "#005533",
+              "redteam_fg": "#bb0000"}  # Green, darker green, red
+}
+DEFAULT_SECTION_COLORS = {"fg": "black", "header_fg": "black"}
+
+# Background color per buffer section
+SECTION_BG_COLORS = {
+    "user": "#f0f8ff",      # Light blue background
+    "background": "#f5f0ff", # Light purple background
+    "parameters": "#fff5f0", # Light orange background
+    "report": "#f0fff5"      # Light green background
+}
+
+# Fonts used by the buffer views
+BOLD_FONT = ("TkDefaultFont", 10, "bold")
+SMALL_FONT = ("TkDefaultFont", 9, "")
+SMALL_BOLD_FONT = ("TkDefaultFont", 9, "bold")
+
+# Per-section (pattern, tag) rules for colouring buffer lines, checked in order
+MESSAGE_TAG_RULES = {
+    "user": (
+        (re.compile(r"^Question:"), "header"),                                          # User questions
+    ),
+    "parameters": (
+        (re.compile(r"\+=|\+0\.|\+.*log-odds|log-odds.*\+", re.I | re.S), "positive"),   # Positive parameter impact
+        (re.compile(r"-=|-0\.|^(?!.*\+).*log-odds", re.I | re.S), "negative"),          # Negative parameter impact
+        (re.compile(r"final log-odds|probability", re.I), "header"),                    # Final probability
+        (re.compile(r"base rate", re.I), "normal"),                                     # Base rate
+        (re.compile(r"conservative shift|moderate shift", re.I), "success"),            # Good shifts
+        (re.compile(r"large shift|extreme shift", re.I), "negative"),                   # Concerning shifts
+    ),
+    "report": (
+        (re.compile(r"probability:", re.I), "header"),                                  # Final probability
+        (re.compile(r"strongest objection|alternate estimate|red team", re.I), "redteam"),  # Red team content
+    ),
+    "background": (
+        (re.compile(r"reference class.*recommended|recommended.*reference class", re.I | re.S), "success"),  # Recommended reference class
+        (re.compile(r"base rate", re.I), "header"),                                     # Base rates are important
+    ),
+}
+
+def classify_message(message, rules):
+    """Pick the display tag for a buffer line given its section's tag rules"""
+    # Special pattern matching for different types of content
+    stripped = message.strip()
+    if stripped.startswith("===") and stripped.endswith("==="):
+        # Headers (e.g. === FINAL FORECAST ===)
+        return "header"
+    if "✓" in message:
+        # Success messages with checkmark
+        return "success"
+    
+    # Section-specific rules, first match wins
+    for pattern, tag in rules:
+        if pattern.search(message):
+            return tag
+    return "normal"
+
+def collapse_repeats(lines):
+    """
+    Collapse runs of (message, timestamp) lines with the same message into one entry.
+    Yields (message, timestamp of the first line, number of repeats).
+    """
+    previous, first_timestamp, repeats = None, None, 0
+    for message, timestamp in lines:
+        if repeats and message == previous:
+            repeats += 1
+            continue
+        if repeats:
+            yield previous, first_timestamp, repeats
+        previous, first_timestamp, repeats = message, timestamp, 1
+    if repeats:
+        yield previous, first_timestamp, repeats
+
+# Lines kept per buffer view; once exceeded by TRIM_SLACK_LINES the oldest are dropped
+# in one delete, so trimming cost is amortized over many inserts
+MAX_VIEW_LINES = 2000
+TRIM_SLACK_LINES = 500
+
+# Event loop running GUI forecasts on a background thread (see get_forecast_loop)
+_forecast_loop = None
+
+# Thread running the buffer viewer opened with /gui from the CLI (see launch_gui_in_process)
+_gui_thread = None
+
 class BufferViewer:
     """
     GUI application that displays multiple forecast buffers in real-time.
@@ -59,16 +158,10 @@ class BufferViewer:
         
         # Dictionary to store text widgets for each buffer
         self.buffer_views = {}
+        self._section_meta = {}
         
         # Color configuration
-        self.colors = {
-            "user": {"fg": "#0078d7", "header_fg": "#005999", "success_fg": "#009900"},  # Blue, darker blue, green
-            "background": {"fg": "#8252c7", "header_fg": "#5a3a8a"},  # Purple, darker purple
-            "parameters": {"fg": "#d75f00", "header_fg": "#a04700", 
-                          "positive_fg": "#007700", "negative_fg": "#cc0000"},  # Orange, darker orange, green, red
-            "report": {"fg": "#007744", "header_fg": "#005533",
-                      "redteam_fg": "#bb0000"}  # Green, darker green, red
-        }
+        self.colors = SECTION_COLORS
         
         # Initial buffer sections and their grid positions (row, column)
         self.sections = {
@@ -109,6 +202,14 @@ class BufferViewer:
         )
         self.clear_button.pack(side=tk.LEFT, padx=5)
         
+        # Clear cache button (forces fresh agent calls on the next forecast)
+        self.clear_cache_button = tk.Button(
+            self.control_panel, 
+            text="Clear Cache", 
+            command=self.clear_agent_cache
+        )
+        self.clear_cache_button.pack(side=tk.LEFT, padx=5)
+        
         # Status bar
         self.status_var = tk.StringVar()
         self.status_var.set("Ready to receive buffer updates")
@@ -117,145 +218,164 @@ class BufferViewer:
         
         # Track last update times for status bar updates
         self.last_update = {section: 0 for section in self.sections}
+        self._status_second = None
+        self._status_clock = ""
+        
+        # Lines waiting to be flushed to the text widgets, filled from the forecast thread.
+        # deque.append/popleft are thread-safe, so the handoff needs no lock. While a view
+        # is hidden its lines wait here, capped like the view itself.
+        self._pending = {section: deque(maxlen=MAX_VIEW_LINES) for section in self.sections}
+        self._flush_scheduled = False
         
-        # Queue for input requests
-        self.input_queue = queue.Queue()
-        self.response_queue = queue.Queue()
+        # Flush lines held back while hidden once the window (or a view) is mapped again
+        root.bind("<Map>", self._schedule_flush, add="+")
         
-        # Start checking for input requests
-        self.check_for_input_requests()
+        # Future of the forecast running on the background loop
+        self.forecast_future = None
         
-        # Store forecast thread
-        self.forecast_thread = None
+        # Set once the window is closed so late observer callbacks are ignored; the
+        # lock makes the check in post_buffer_line atomic with closing
+        self.closed = False
+        self._close_lock = threading.Lock()
     
     def create_buffer_view(self, section, position):
         """Create a scrolled text widget for a buffer section at given grid position"""
         row, col = position
-        frame = tk.LabelFrame(self.container, text=section.upper(), font=("TkDefaultFont", 10, "bold"), fg="black")
+        frame = tk.LabelFrame(self.container, text=section.upper(), font=BOLD_FONT, fg="black")
         frame.grid(row=row, column=col, sticky='nsew', padx=5, pady=5)
         
         # Set background color for frame based on section
-        section_bg_colors = {
-            "user": "#f0f8ff",      # Light blue background
-            "background": "#f5f0ff", # Light purple background
-            "parameters": "#fff5f0", # Light orange background
-            "report": "#f0fff5"      # Light green background
-        }
-        
-        bg_color = section_bg_colors.get(section, "#ffffff")
+        bg_color = SECTION_BG_COLORS.get(section, "#ffffff")
         frame.configure(bg=bg_color)
         
-        # Create text widget with matching background
-        text_widget = scrolledtext.ScrolledText(frame, wrap=tk.WORD, bg=bg_color)
+        # Create text widget with matching background (read-only, so no undo history)
+        text_widget = scrolledtext.ScrolledText(frame, wrap=tk.WORD, bg=bg_color,
+                                                undo=False, autoseparators=False, maxundo=0)
         text_widget.pack(fill='both', expand=True)
         
         # Configure tags for this section
-        colors = self.colors.get(section, {"fg": "black", "header_fg": "black"})
+        colors = self.colors.get(section, DEFAULT_SECTION_COLORS)
         
         # Basic color for normal text
         text_widget.tag_configure("normal", foreground=colors["fg"])
         
         # Headers (=== TEXT ===)
         text_widget.tag_configure("header", foreground=colors["header_fg"], 
-                                 font=("TkDefaultFont", 10, "bold"),
+                                 font=BOLD_FONT,
                                  spacing1=5, spacing3=5)  # Add spacing around headers
         
         # Success messages (with ✓)
         if "success_fg" in colors:
             text_widget.tag_configure("success", foreground=colors["success_fg"], 
-                                     font=("TkDefaultFont", 10, "bold"))
+                                     font=BOLD_FONT)
         
         # Parameters-specific tags
         if section == "parameters":
             text_widget.tag_configure("positive", foreground=colors["positive_fg"], 
-                                     font=("TkDefaultFont", 9, ""))
+                                     font=SMALL_FONT)
             text_widget.tag_configure("negative", foreground=colors["negative_fg"],
-                                     font=("TkDefaultFont", 9, ""))
+                                     font=SMALL_FONT)
         
         # Report-specific tags
         if section == "report":
             text_widget.tag_configure("redteam", foreground=colors["redteam_fg"],
-                                     font=("TkDefaultFont", 9, "bold"))
+                                     font=SMALL_BOLD_FONT)
         
         # Timestamp tag (light gray)
         text_widget.tag_configure("timestamp", foreground="#999999")
             
-        # Store the text widget reference
+        # Store the text widget reference, plus what the flush loop needs per section
         self.buffer_views[section] = text_widget
+        self._section_meta[section] = (text_widget, MESSAGE_TAG_RULES.get(section, ()))
     
-    def update_buffer_line(self, section, message, timestamp):
+    def post_buffer_line(self, section, message, timestamp):
         """
-        Add a single line to a buffer section.
-        This is called by the BufferManager as an observer.
+        Queue a buffer line for display on the Tk thread.
+        This is called by the BufferManager as an observer from the forecast thread.
+        
+        Lines are coalesced and flushed at most once per frame (FLUSH_INTERVAL_MS),
+        so bursts of output cost one widget update per section instead of one per line.
         """
-        if section in self.buffer_views:
-            text_widget = self.buffer_views[section]
-            text_widget.configure(state='normal')
-            
-            # Insert the timestamp with light gray color
-            text_widget.insert(tk.END, f"[{timestamp}] ", "timestamp")
+        lines = self._pending.get(section)
+        if lines is None:
+            return
+        with self._close_lock:
+            if self.closed:
+                return
+            lines.append((message, timestamp))
+        # Scheduled outside the lock: Tk calls from this thread wait on the Tk thread,
+        # which may itself be waiting for the lock in mark_closed
+        try:
+            self._schedule_flush()
+        except (tk.TclError, RuntimeError):
+            # The window was destroyed after the check; nothing is left to update
+            pass
+    
+    def mark_closed(self):
+        """Stop accepting buffer lines; call before destroying the window"""
+        with self._close_lock:
+            self.closed = True
+    
+    def _schedule_flush(self, event=None):
+        """Schedule a flush of pending lines unless one is already scheduled"""
+        # A flush that is already scheduled clears the flag before draining, so it
+        # will pick up lines queued before it runs
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after(FLUSH_INTERVAL_MS, self._flush_pending)
+    
+    def _flush_pending(self):
+        """Insert all queued buffer lines into their text widgets (Tk thread only)"""
+        # Clear the flag first: lines posted from now on schedule the next flush
+        self._flush_scheduled = False
+        pending = self._pending
+        classify = classify_message
+        now = time.time()
+        
+        updated = []
+        for section, (text_widget, rules) in self._section_meta.items():
+            queued = pending[section]
+            # Lines for hidden views (e.g. a minimized window) wait until it is shown again
+            if not queued or not text_widget.winfo_viewable():
+                continue
             
-            # Determine which tag to use based on the content and section
-            tag = "normal"
+            # Build one insert call with alternating text/tag arguments
+            insert_args = []
+            extend = insert_args.extend
+            popleft = queued.popleft
+            for message, timestamp, repeats in collapse_repeats([popleft() for _ in range(len(queued))]):
+                text = f"{message} (×{repeats})\n" if repeats > 1 else message + "\n"
+                extend((f"[{timestamp}] ", "timestamp", text, classify(message, rules)))
             
-            # Special pattern matching for different types of content
-            if message.strip().startswith("===") and message.strip().endswith("==="):
-                # Headers (e.g. === FINAL FORECAST ===)
-                tag = "header"
-            elif "✓" in message:
-                # Success messages with checkmark
-                tag = "success"
-            elif section == "user" and message.startswith("Question:"):
-                # User questions 
-                tag = "header"
-            elif section == "parameters":
-                # Parameter-specific formatting
-                if "+=" in message or "+0." in message or "+" in message and "log-odds" in message.lower():
-                    # Positive parameter impact
-                    tag = "positive"
-                elif "-=" in message or "-0." in message or ("log-odds" in message.lower() and not "+" in message):
-                    # Negative parameter impact
-                    tag = "negative"
-                elif "final log-odds" in message.lower() or "probability" in message.lower():
-                    # Final probability
-                    tag = "header"
-                elif "base rate" in message.lower():
-                    # Base rate
-                    tag = "normal"
-                elif "conservative shift" in message.lower() or "moderate shift" in message.lower():
-                    # Good shifts
-                    tag = "success" 
-                elif "large shift" in message.lower() or "extreme shift" in message.lower():
-                    # Concerning shifts
-                    tag = "negative"
-            elif section == "report":
-                # Report-specific formatting
-                if "probability:" in message.lower():
-                    # Final probability
-                    tag = "header"
-                elif "strongest objection" in message.lower() or "alternate estimate" in message.lower() or "red team" in message.lower():
-                    # Red team content
-                    tag = "redteam"
-            elif section == "background":
-                # Background-specific formatting
-                if "reference class" in message.lower() and "recommended" in message.lower():
-                    # Recommended reference class
-                    tag = "success"
-                elif "base rate" in message.lower():
-                    # Base rates are important
-                    tag = "header"
-                    
-            # Insert the message with the appropriate tag
-            text_widget.insert(tk.END, message + "\n", tag)
-            text_widget.see(tk.END)  # Auto-scroll to bottom
+            # Only follow new output if the user hasn't scrolled up to read earlier lines
+            at_bottom = text_widget.yview()[1] > 0.999
+            text_widget.configure(state='normal')
+            text_widget.insert(tk.END, *insert_args)
+            # Drop the oldest lines once the view has grown well past its cap
+            line_count = int(text_widget.index('end-1c').split('.')[0])
+            if line_count > MAX_VIEW_LINES + TRIM_SLACK_LINES:
+                text_widget.delete("1.0", f"{line_count - MAX_VIEW_LINES + 1}.0")
+            if at_bottom:
+                text_widget.see(tk.END)  # Auto-scroll to bottom
             text_widget.configure(state='disabled')
             
             # Update last update time for status bar
-            self.last_update[section] = time.time()
-            self.status_var.set(f"Updated buffer '{section}' at {datetime.datetime.now().strftime('%H:%M:%S')}")
-
+            self.last_update[section] = now
+            updated.append(section)
+        
+        if updated:
+            # Format the clock at most once per second
+            second = int(now)
+            if second != self._status_second:
+                self._status_second = second
+                self._status_clock = time.strftime('%H:%M:%S', time.localtime(second))
+            self.status_var.set(f"Updated {', '.join(updated)} at {self._status_clock}")
+    
     def clear_all_buffers(self):
         """Clear all buffer views"""
+        # Drop lines not yet flushed too, or they would reappear on the next flush
+        for lines in self._pending.values():
+            lines.clear()
         for section in self.buffer_views:
             text_widget = self.buffer_views[section]
             text_widget.configure(state='normal')
@@ -264,6 +384,12 @@ class BufferViewer:
         
         self.status_var.set("Cleared all buffers")
     
+    def clear_agent_cache(self):
+        """Forget cached agent outputs so the next forecast calls the LLM again"""
+        # The cache is used from the forecast loop, so clear it there
+        get_forecast_loop().call_soon_threadsafe(clear_cache)
+        self.status_var.set("Cleared cached agent outputs")
+    
     def run_new_forecast(self):
         """Display dialog for entering a new forecast question"""
         question = simpledialog.askstring("AI Superforecaster", 
@@ -272,51 +398,45 @@ class BufferViewer:
         if question:
             # Clear buffers first
             self.clear_all_buffers()
-            
-            # Start forecast thread
-            self.forecast_thread = threading.Thread(
-                target=run_forecast_process,
-                args=(question, self),
-                daemon=True
-            )
-            self.forecast_thread.start()
+            self.start_forecast(question)
         else:
             self.status_var.set("No question provided")
     
+    def start_forecast(self, question):
+        """Run the forecast pipeline in-process on the background forecast loop"""
+        self.forecast_future = run_forecast_process(question, self)
+    
     def request_user_input(self, prompt):
         """
         Request input from the user via dialog box.
-        This function is called from the forecasting thread.
+        This function is called from the forecasting thread and blocks until
+        the dialog scheduled on the Tk thread has been answered.
         """
-        # Put the request in the queue and wait for the response
-        self.input_queue.put(prompt)
-        return self.response_queue.get()
+        done = threading.Event()
+        result = {}
+        
+        def show_dialog():
+            result["response"] = self.show_input_dialog(prompt)
+            done.set()
+        
+        self.root.after(0, show_dialog)
+        done.wait()
+        return result["response"]
     
-    def check_for_input_requests(self):
-        """Check if there are any input requests and handle them"""
-        try:
-            # Non-blocking check for input requests
-            if not self.input_queue.empty():
-                prompt = self.input_queue.get_nowait()
-                self.status_var.set("Input required...")
-                
-                # Show an input dialog
-                response = simpledialog.askstring("Input Required", 
-                                                 prompt,
-                                                 parent=self.root)
-                
-                # Default to empty string if user cancels
-                if response is None:
-                    response = ""
-                    
-                # Put the response in the queue
-                self.response_queue.put(response)
-                self.status_var.set("Input provided, continuing...")
-        except queue.Empty:
-            pass
-            
-        # Check again after a delay (100ms)
-        self.root.after(100, self.check_for_input_requests)
+    def show_input_dialog(self, prompt):
+        """Show an input dialog and return the response (Tk thread only)"""
+        self.status_var.set("Input required...")
+        
+        response = simpledialog.askstring("Input Required", 
+                                         prompt,
+                                         parent=self.root)
+        
+        # Default to empty string if user cancels
+        if response is None:
+            response = ""
+        
+        self.status_var.set("Input provided, continuing...")
+        return response
 
 class GuiInputProvider:
     """Input provider for GUI mode that requests input via the GUI"""
@@ -336,7 +456,7 @@ async def run_forecast_async(question, viewer):
         # Register the buffer viewer as observer
         buffer_manager.register_observer(
             lambda section, message, timestamp, content_type=None: 
-            viewer.update_buffer_line(section, message, timestamp)
+            viewer.post_buffer_line(section, message, timestamp)
         )
         
         # Initialize the buffers with standard headers
@@ -361,9 +481,60 @@ async def run_forecast_async(question, viewer):
         if viewer:
             viewer.status_var.set(f"Error: {str(e)}")
 
+def launch_gui_in_process(buffer_manager):
+    """
+    Open the buffer viewer for a CLI session in this process, on its own thread.
+    The viewer shows what has been written so far and follows new lines.
+    
+    Returns False if a viewer opened this way is still running.
+    """
+    global _gui_thread
+    if _gui_thread is not None and _gui_thread.is_alive():
+        return False
+    
+    def run_viewer():
+        # Every Tk call for this window happens on this thread
+        root = tk.Tk()
+        root.geometry("1200x800")
+        viewer = BufferViewer(root)
+        # Forecasts are started (and the cache cleared) from the CLI prompt, not from this
+        # window: the cache belongs to the CLI's event loop, not the GUI forecast loop
+        viewer.new_forecast_button.configure(state=tk.DISABLED)
+        viewer.clear_cache_button.configure(state=tk.DISABLED)
+        
+        def on_close():
+            # Stop taking lines and detach from the buffers before tearing down Tk, so
+            # later writes never reach a destroyed root (and reopening adds no duplicate)
+            viewer.mark_closed()
+            buffer_manager.unregister_observer(viewer.post_buffer_line)
+            root.destroy()
+        root.protocol("WM_DELETE_WINDOW", on_close)
+        
+        for section in viewer.sections:
+            for entry in buffer_manager.entries(section):
+                viewer.post_buffer_line(section, str(entry["content"]), entry["timestamp"])
+        buffer_manager.register_observer(viewer.post_buffer_line)
+        
+        root.mainloop()
+    
+    _gui_thread = threading.Thread(target=run_viewer, daemon=True)
+    _gui_thread.start()
+    return True
+
+def get_forecast_loop():
+    """
+    Get the persistent event loop used for GUI forecasts, starting it on first use.
+    Reusing one loop keeps pooled HTTP connections warm between forecasts.
+    """
+    global _forecast_loop
+    if _forecast_loop is None:
+        _forecast_loop = event_loop.new_event_loop()
+        threading.Thread(target=_forecast_loop.run_forever, daemon=True).start()
+    return _forecast_loop
+
 def run_forecast_process(question, viewer):
-    """Run the forecast in a separate thread"""
-    asyncio.run(run_forecast_async(question, viewer))
+    """Schedule the forecast on the background loop and return its future"""
+    return asyncio.run_coroutine_threadsafe(run_forecast_async(question, viewer), get_forecast_loop())
 
 async def handle_cli_mode(buffer_manager, input_provider):
     """Handle command-line interactive mode"""
@@ -403,14 +574,27 @@ async def handle_cli_mode(buffer_manager, input_provider):
                     else:
                         print(f"Buffer '{buffer_name}' not found.")
                     continue
+                elif command == "/clearcache":
+                    clear_cache()
+                    print("Cached agent outputs cleared.")
+                    continue
+                elif command == "/nocache":
+                    set_cache_enabled(False)
+                    print("Caching disabled for this session.")
+                    continue
                 elif command == "/gui":
-                    # Launch the buffer viewer GUI in a separate process
-                    print("Launching buffer viewer...")
-                    subprocess.Popen([sys.executable, __file__, "--view-only"])
+                    if sys.platform == "darwin":
+                        # Tk must own the main thread on macOS, so use a separate process there
+                        print("Launching buffer viewer...")
+                        subprocess.Popen([sys.executable, __file__, "--view-only"])
+                    elif launch_gui_in_process(buffer_manager):
+                        print("Launching buffer viewer...")
+                    else:
+                        print("The buffer viewer is already open.")
                     continue
                 else:
                     print("Unknown command.")
-                    print(f"Available commands: /help, /rerun, /view, /quit, /gui")
+                    print(f"Available commands: /help, /rerun, /view, /clearcache, /nocache, /quit, /gui")
                     continue
             
             # Skip empty input
@@ -420,7 +604,7 @@ async def handle_cli_mode(buffer_manager, input_provider):
             # Process the question
             await run_full_pipeline(user_input, buffer_manager, input_provider)
             
-            print("\nEnter a new question or command (/help, /rerun, /view, /quit, /gui):")
+            print("\nEnter a new question or command (/help, /rerun, /view, /clearcache, /nocache, /quit, /gui):")
         except (EOFError, KeyboardInterrupt):
             print("\nExiting...")
             break
@@ -437,6 +621,8 @@ def print_cli_help():
     print("\nCommands (during interactive session):")
     print("  /rerun - Start a new forecast")
     print(f"  /view <buffer> - View buffer contents ({', '.join(get_buffer_names())})")
+    print("  /clearcache - Forget cached agent outputs")
+    print("  /nocache - Stop using cached outputs for this session")
     print("  /help - Show this help message")
     print("  /quit - Exit the application")
     print("  /gui - Launch the buffer viewer GUI")
@@ -444,7 +630,10 @@ def print_cli_help():
 async def main_async():
     """Async main function that handles all execution modes"""
     # Parse command line arguments
-    parser = argparse.ArgumentParser(description="AI Superforecaster")
+    parser = argparse.ArgumentParser(
+        description="AI Superforecaster",
+        epilog="Environment: SF_MAX_CONCURRENCY caps concurrent parameter researcher calls (default 5).",
+    )
     parser.add_argument("question", nargs="?", help="Forecasting question (optional)")
     parser.add_argument("--cli", action="store_true", help="Run in command-line interface mode")
     parser.add_argument("--view-only", action="store_true", help="Launch only the buffer viewer")
@@ -452,8 +641,12 @@ async def main_async():
                       help="Run in non-interactive mode with input from stdin")
     parser.add_argument("--output", "-o", choices=get_buffer_names(), default="user", help="Which buffer to output")
     parser.add_argument("--help-buffers", action="store_true", help="Show detailed information about buffers")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the LLM instead of reusing cached agent outputs")
     args = parser.parse_args()
     
+    if args.no_cache:
+        set_cache_enabled(False)
+    
     # If help for buffers is requested, show that and exit
     if args.help_buffers:
         print_cli_help()
@@ -461,6 +654,11 @@ async def main_async():
     
     # Command-line interface mode
     if args.cli:
+        # Batch console output: the pipeline writes the echoed user buffer only through
+        # display functions, which flush once per call, instead of one terminal write per line
+        if sys.stdout.isatty() and hasattr(sys.stdout, "reconfigure"):
+            sys.stdout.reconfigure(line_buffering=False)
+        
         # Initialize buffer manager for CLI mode
         buffer_manager = BufferManager(echo_user=True)
         init_buffers(buffer_manager)
@@ -475,7 +673,7 @@ async def main_async():
             
         # Non-interactive mode from stdin
         if args.non_interactive:
-            print("Reading from stdin...")
+            print("Reading from stdin...", flush=True)
             question = sys.stdin.read().strip()
             if question:
                 await run_full_pipeline(question, buffer_manager, input_provider)
@@ -496,14 +694,18 @@ async def main_async():
     # If a question was provided, start forecast immediately
     if args.question:
         # Schedule after a short delay to let the GUI initialize
-        root.after(500, lambda: run_forecast_process(args.question, viewer))
+        root.after(500, lambda: viewer.start_forecast(args.question))
     
     # Run the Tkinter event loop
     root.mainloop()
+    
+    # Stop the background forecast loop once the window is closed
+    if _forecast_loop is not None:
+        _forecast_loop.call_soon_threadsafe(_forecast_loop.stop)
 
 def main():
     """Main entry point for the application"""
-    asyncio.run(main_async())
+    event_loop.run(main_async())
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
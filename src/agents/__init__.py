@@ -1,4 +1,7 @@
 from src.agents.research_agents import background_info_agent, reference_class_agent
-from src.agents.parameter_agents import parameter_design_agent, parameter_researcher_agent
-from src.agents.synthesis_agents import synthesis_agent, red_team_agent
+from src.agents.parameter_agents import (parameter_design_agent, parameter_design_agent_large,
+                                        parameter_researcher_agent, batch_parameter_researcher_agent,
+                                        is_parameter_design_acceptable)
+from src.agents.synthesis_agents import (synthesis_agent, red_team_agent, red_team_agent_large,
+                                        is_red_team_acceptable)
 from src.agents.question_agents import question_validator_agent, question_clarifier_agent, forecast_orchestrator 
\ No newline at end of file
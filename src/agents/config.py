@@ -0,0 +1,10 @@
+"""
+Agent Model Configuration for AI Superforecaster
+
+Model names shared by the agent definitions. Agents default to the small
+model; agents whose output passes through a quality gate keep a large-model
+fallback that is only used when the small model's output is rejected.
+"""
+
+SMALL_MODEL = "gpt-4.1-mini"
+LARGE_MODEL = "gpt-4.1"
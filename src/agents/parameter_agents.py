@@ -5,12 +5,14 @@ This module defines agents responsible for designing and researching
 parameters for forecasting questions.
 """
 from agents import Agent, ModelSettings
-from src.models import ForecastParameters, ParameterSample
+from src.models import ForecastParameters, ParameterSample, ParameterSampleBatch
 from src.utils.tools import WebSearchTool
+from src.agents.prompts import FINAL_ANSWER_RULE, EVIDENCE_RULE, CONTEXT_REUSE_RULE
+from src.agents.config import SMALL_MODEL, LARGE_MODEL
 
 parameter_design_agent = Agent(
     name="Parameter Designer",
-    instructions="""You design the key parameters needed to estimate a forecasting question given a reference class and base rate.
+    instructions=f"""You design the key parameters needed to estimate a forecasting question given a reference class and base rate.
 
 For each forecasting question:
 1. Start with first principles thinking to identify what fundamentally matters to this question
@@ -25,6 +27,7 @@ For each forecasting question:
    - Specify either a 0-10, 0-100%, or similar numeric scale
    - Identify how this parameter interacts with others (additive, multiplicative, etc.)
    - Do NOT provide numeric estimates yet - focus on structure only
+4. {CONTEXT_REUSE_RULE}
 
 IMPORTANT GUIDELINES:
 - For 0-10 scales, clearly define what each end of the scale represents
@@ -38,25 +41,35 @@ Good example parameters:
   * Technical feasibility (0-10 scale where 0=impossible, 5=moderate challenges, 10=no obstacles)
   * Research funding growth (0-10 scale where 0=major decline, 5=steady state, 10=exponential growth)
   * Current progress rate (0-10 scale where 0=stalled, 5=linear progress, 10=accelerating rapidly)
-  * Regulatory environment (0-10 scale where 0=highly restrictive, 5=balanced, 10=supportive)
-
-The goal is to define parameters that:
-1. Have clear, measurable definitions with well-defined scales
-2. Drive the outcome in an understandable way
-3. Can be researched separately""",
+  * Regulatory environment (0-10 scale where 0=highly restrictive, 5=balanced, 10=supportive)""",
     output_type=ForecastParameters,
     tools=[WebSearchTool()],
-    model="gpt-4.1",
+    model=SMALL_MODEL,
 )
 
+# Used only when the small model's design fails is_parameter_design_acceptable
+parameter_design_agent_large = parameter_design_agent.clone(model=LARGE_MODEL)
+
+
+def is_parameter_design_acceptable(design: ForecastParameters) -> bool:
+    """Cheap structural check that a parameter design is usable."""
+    names = [param.name.strip().lower() for param in design.parameters]
+    return (
+        4 <= len(names) <= 6
+        and all(names)
+        and len(set(names)) == len(names)
+        and all(param.scale_description.strip() for param in design.parameters)
+    )
+
 
 parameter_researcher_agent = Agent(
     name="Parameter Researcher",
-    instructions="""You research a specific forecasting parameter to provide an evidence-based estimate.
+    instructions=f"""You research a specific forecasting parameter to provide an evidence-based estimate.
 
 For the given parameter:
-1. Run at least 3 web searches to gather relevant data and evidence
+1. Run at least 3 web searches to gather relevant data and evidence. {CONTEXT_REUSE_RULE}
 2. Systematically translate the evidence into both a parameter value and Δ log-odds
+3. Cite your sources clearly
 
 REASONING PROCESS:
 In your reasoning field, follow this specific process before deciding on final values:
@@ -64,7 +77,7 @@ In your reasoning field, follow this specific process before deciding on final v
 2. Then identify 2-3 candidate parameter values with different supporting evidence
 3. Explicitly debate the merits of each candidate value
 4. Only after this deliberation should you select a final parameter value
-5. Never state your final value in the reasoning section - save this for the dedicated value fields
+5. {FINAL_ANSWER_RULE}
 
 VARIANCE REDUCTION APPROACH:
 Approach your parameter estimation from multiple perspectives:
@@ -85,19 +98,22 @@ The relationship between parameter values and log-odds should generally follow t
 - Moderate evidence: medium shifts in log-odds (±0.4 to ±0.6)
 - Strong evidence: larger shifts in log-odds (±0.7 to ±1.0)
 
-However, you should calibrate these based on the specific context and strength of evidence rather than rigidly following these ranges.
+Calibrate these to the specific context and strength of evidence rather than rigidly following the ranges.
 
-3. Cite your sources clearly
-4. Provide concise reasoning for your estimate
+If data is limited, use analogous situations or expert judgments from reputable sources. {EVIDENCE_RULE}""",
+    tools=[WebSearchTool()],
+    output_type=ParameterSample,
+    model=SMALL_MODEL,
+) 
 
-Examples:
-- Parameter value 7/10 could map to a positive log-odds contribution if evidence meaningfully increases probability
-- Parameter value 3/10 could map to a negative log-odds contribution if evidence meaningfully decreases probability
 
-Focus on finding objective data wherever possible. If data is limited, use analogous situations or expert judgments from reputable sources.
+# Researches all parameters in one call so the instructions and shared context are sent once
+batch_parameter_researcher_agent = parameter_researcher_agent.clone(
+    name="Batch Parameter Researcher",
+    instructions="""You will receive several parameters to research for one forecasting question.
+Research every parameter following the instructions below, running web searches for each, and
+return exactly one sample per parameter in the same order the parameters were given.
 
-Keep your reasoning concise and data-driven.""",
-    tools=[WebSearchTool()],
-    output_type=ParameterSample,
-    model="gpt-4.1-mini",
-) 
\ No newline at end of file
+""" + parameter_researcher_agent.instructions,
+    output_type=ParameterSampleBatch,
+)
@@ -0,0 +1,15 @@
+"""
+Shared Prompt Fragments for AI Superforecaster
+
+Instruction text that several agents repeat verbatim lives here so it is
+written (and paid for in tokens) once per agent rather than rephrased.
+"""
+
+# Keeps the reasoning field deliberative instead of anchoring on the answer
+FINAL_ANSWER_RULE = "Never state your final answer in the reasoning or rationale text - save it for the dedicated output fields."
+
+# Closing directive for agents that rely on research
+EVIDENCE_RULE = "Be objective and data-driven; prefer empirical evidence over opinion."
+
+# For searching agents whose prompt already carries the researched world context
+CONTEXT_REUSE_RULE = "The world context, recent events and trends in your input are already researched - reuse them and spend web searches only on data they don't cover."
@@ -6,10 +6,12 @@ forecasting questions.
 """
 from agents import Agent, Runner, input_guardrail, GuardrailFunctionOutput, RunContextWrapper, ModelSettings, InputGuardrailTripwireTriggered
 from src.models import ForecastabilityCheck, QuestionClarification
+from src.agents.prompts import FINAL_ANSWER_RULE
+from src.agents.config import SMALL_MODEL
 
 question_validator_agent = Agent(
     name="Question Validator",
-    instructions="""You determine if a question can be reasonably forecasted.
+    instructions=f"""You determine if a question can be reasonably forecasted.
 
 MOST IMPORTANT REQUIREMENT: Valid forecasting questions MUST follow the pattern "What is the probability that [event] happens by [time]?" or a very close variation.
 
@@ -19,7 +21,7 @@ In your reasoning field, follow this specific process before deciding if a quest
 2. Analyze both why the question might be forecastable AND why it might not be
 3. Explicitly consider multiple interpretations of ambiguous questions
 4. Only after this balanced analysis should you determine forecastability
-5. Never state your final decision in the reasoning section - save this for the dedicated is_forecastable field
+5. {FINAL_ANSWER_RULE}
 
 Valid forecast questions:
 - MUST ask about a specific future event with clear outcome criteria
@@ -48,18 +50,11 @@ Example invalid questions:
 - "When will AI achieve human-level intelligence?" (no probability framing)
 - "How much will Bitcoin be worth in 2025?" (asks for value, not probability)
 - "What is the best programming language?" (opinion)
-- "Is the universe infinite?" (unfalsifiable)
-- "What is the chance I'll enjoy this movie?" (personal preference)
 - "Will my startup be successful?" (too vague, no timeframe)
 
-For each question, strictly assess if it:
-1. Is formatted as a probability question about a future event
-2. Contains a specific timeframe or deadline
-3. Has a clearly measurable outcome condition
-
-If any of these criteria are missing, mark it as not forecastable.""",
+If the question is not a probability question about a future event with a specific timeframe and a clearly measurable outcome, mark it as not forecastable.""",
     output_type=ForecastabilityCheck,
-    model="gpt-4.1-mini",
+    model=SMALL_MODEL,
 )
 
 
@@ -90,22 +85,15 @@ If the question needs clarification:
 - Mark the question as needing clarification
 - Suggest a clarified version based on reasonable assumptions that follows the required format
 
-If the question is already clear:
-- Format it consistently as "What is the probability that [event] happens by [time]?"
-- Do NOT mark it as needing clarification
-- Do NOT generate follow-up questions
+If the question is already clear, reformat it into the required format without marking it as needing clarification or generating follow-up questions.
 
 Examples of good clarifications:
 - "Will AI replace programmers?" → "What is the probability that AI systems will autonomously perform >50% of commercial software development tasks by 2030?"
 - "Is Bitcoin a good investment?" → "What is the probability that Bitcoin will outperform the S&P 500 in total return over the next 12 months?"
 
-Use language that is:
-- Precise and unambiguous
-- Measurable with clear criteria
-- Time-bound with specific deadlines
-- Neutral and objective""",
+Use precise, neutral, measurable and time-bound language.""",
     output_type=QuestionClarification,
-    model="gpt-4.1-mini",
+    model=SMALL_MODEL,
 )
 
 
@@ -137,6 +125,6 @@ async def forecastability_guardrail(
 forecast_orchestrator = Agent(
     name="Forecast Orchestrator",
     instructions="""You are an orchestrator that guides the user through forecasting a question.""",
-    model="gpt-4.1-mini",
+    model=SMALL_MODEL,
     input_guardrails=[forecastability_guardrail],
 ) 
\ No newline at end of file
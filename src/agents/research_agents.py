@@ -7,10 +7,12 @@ and finding appropriate reference classes for forecasting questions.
 from agents import Agent, ModelSettings
 from src.models import BackgroundInfoOutput, ReferenceClassOutput
 from src.utils.tools import WebSearchTool
+from src.agents.prompts import EVIDENCE_RULE
+from src.agents.config import SMALL_MODEL
 
 background_info_agent = Agent(
     name="Background Information Provider",
-    instructions="""You provide up-to-date context about the current state of the world to help with forecasting.
+    instructions=f"""You provide up-to-date context about the current state of the world to help with forecasting.
 
 Your task is to:
 1. Search for recent major events and developments that may impact forecasts
@@ -25,10 +27,10 @@ Focus on:
 - Social and political shifts
 - Environmental changes or events
 
-Be objective and factual. Prioritize information that would be most relevant for forecasting.""",
+Prioritize information that would be most relevant for forecasting. {EVIDENCE_RULE}""",
     tools=[WebSearchTool()],
     output_type=BackgroundInfoOutput,
-    model="gpt-4.1-mini",
+    model=SMALL_MODEL,
 )
 
 
@@ -81,15 +83,8 @@ AVOID:
 - Classes based primarily on expert opinion rather than historical data
 - Classes that fail to capture the SPECIFIC outcome being forecast
 
-CRITICAL SELF-CHECK:
-Before finalizing, ask yourself:
-- "If I were betting my own money, would I trust these reference classes?"
-- "Have I found the most relevant historical analogues possible?"
-- "Would domain experts agree these are appropriate comparisons?"
-- "Have I adjusted for unique aspects of the current situation?"
-
 If you're not satisfied with the quality of reference classes after searches, CREATE A CUSTOM reference class that more precisely matches the question, even if you have to make educated estimates about the base rate.""",
     tools=[WebSearchTool()],
     output_type=ReferenceClassOutput,
-    model="gpt-4.1-mini",
+    model=SMALL_MODEL,
 ) 
\ No newline at end of file
@@ -6,10 +6,12 @@ and providing red team analysis.
 """
 from agents import Agent, ModelSettings
 from src.models import FinalForecast, RedTeamOutput
+from src.agents.prompts import FINAL_ANSWER_RULE
+from src.agents.config import SMALL_MODEL, LARGE_MODEL
 
 synthesis_agent = Agent(
     name="Forecast Synthesizer",
-    instructions="""You create the final forecast by combining the base rate with parameter estimates.
+    instructions=f"""You create the final forecast by combining the base rate with parameter estimates.
 
 Starting with:
 1. A base rate from reference class forecasting
@@ -32,7 +34,7 @@ In your rationale field, follow this specific process before deciding on your fi
    - One that gives parameters more weight relative to the base rate
    - One that adjusts for potential overconfidence or underappreciated uncertainty
 3. Explicitly debate the merits of each candidate probability
-4. Never state your final probability in the rationale - save this for the dedicated estimate fields
+4. {FINAL_ANSWER_RULE}
 
 VARIANCE REDUCTION APPROACH:
 Before finalizing your forecast, imagine three different superforecasters analyzing this question:
@@ -56,14 +58,14 @@ Common superforecaster ranges:
 - Base rate moves from 50% → 90% requires log-odds shift of +2.2
 
 Your final forecast should strike a balance between the outside view (base rate) and the inside view (parameter adjustments). Be explicit about how much weight you give to the base rate versus specific parameters.""",
-    model="gpt-4.1",
+    model=LARGE_MODEL,
     output_type=FinalForecast,
 )
 
 
 red_team_agent = Agent(
     name="Red Team Challenger",
-    instructions="""You are a Red Team challenger who finds flaws in forecasts and provides alternative perspectives.
+    instructions=f"""You are a Red Team challenger who finds flaws in forecasts and provides alternative perspectives.
 
 Your task is to:
 1. Challenge a forecast by identifying its weakest assumptions and potential biases
@@ -76,7 +78,7 @@ In your rationale field, follow this specific process before deciding on your al
 1. Document the key flaws or weaknesses in the original forecast
 2. Consider at least 3 different alternative probability ranges that address these flaws
 3. Explicitly evaluate the relative strength of each alternative
-4. Never state your final alternative probability in the rationale - save this for the dedicated estimate fields
+4. {FINAL_ANSWER_RULE}
 
 VARIANCE REDUCTION APPROACH:
 To ensure your criticism is thorough and well-calibrated:
@@ -95,6 +97,18 @@ IMPORTANT GUIDELINES:
 Your goal is not to nitpick but to provide a credible alternative perspective that challenges
 the core assumptions. Think of yourself as a thoughtful rival forecaster who sees the same
 evidence but reaches a different conclusion.""",
-    model="gpt-4.1",
+    model=SMALL_MODEL,
     output_type=RedTeamOutput,
-) 
\ No newline at end of file
+)
+
+# Used only when the small model's challenge fails is_red_team_acceptable
+red_team_agent_large = red_team_agent.clone(model=LARGE_MODEL)
+
+
+def is_red_team_acceptable(red_team: RedTeamOutput) -> bool:
+    """Cheap consistency check that a red team challenge is usable."""
+    return (
+        0.0 <= red_team.alternate_low <= red_team.alternate_estimate <= red_team.alternate_high <= 1.0
+        and bool(red_team.strongest_objection.strip())
+        and len(red_team.key_disagreements) >= 2
+    ) 
\ No newline at end of file
@@ -7,20 +7,30 @@ It implements reference class forecasting, parameter research,
 log-odds arithmetic, and red team analysis.
 """
 import asyncio
-import json
 import datetime
 import os
+from typing import List
 
-from agents import Runner, trace, InputGuardrailTripwireTriggered
+import numpy as np
+import orjson
+from agents import trace, InputGuardrailTripwireTriggered, AgentsException
 from src.models import *
 from src.agents import (background_info_agent, reference_class_agent, parameter_design_agent, 
-                   parameter_researcher_agent, synthesis_agent, question_validator_agent,
-                   question_clarifier_agent, forecast_orchestrator, red_team_agent)
+                   parameter_design_agent_large, is_parameter_design_acceptable,
+                   parameter_researcher_agent, batch_parameter_researcher_agent,
+                   synthesis_agent, question_validator_agent,
+                   question_clarifier_agent, forecast_orchestrator, red_team_agent,
+                   red_team_agent_large, is_red_team_acceptable)
 from src.ui.cli import *
 from src.utils.tools import WebSearchTool
 from src.utils.forecast_math import logit, inv_logit
 from src.utils.buffers import BufferManager
 from src.utils.buffer_config import get_buffer_names
+from src.utils.http_client import use_shared_http_client
+from src.utils.agent_cache import cached_run, run_with_escalation, get_cached_forecast, cache_forecast
+
+# Maximum number of parameter researcher agents running at once
+MAX_CONCURRENT_RESEARCH = int(os.getenv("SF_MAX_CONCURRENCY", "5"))
 
 class ConsoleInputProvider:
     """Default input provider that uses console input"""
@@ -47,24 +57,28 @@ async def run_full_pipeline(user_question, buffers=None, input_provider=None):
     if input_provider is None:
         input_provider = ConsoleInputProvider()
     
+    # Reuse pooled connections for every agent call in this pipeline
+    use_shared_http_client()
+    
+    # Date the agents should treat as "today", fixed for the whole run (including retries)
+    current_date = datetime.date.today().isoformat()
+    
     # Main forecasting loop - will retry if validation fails
     while True:
         with trace("Forecasting workflow"):
             try:
                 # Display the initial user question
-                buffers.write("user", f"Question: {user_question}")
+                display_status(f"Question: {user_question}")
                 
                 # Start with the orchestrator for question validation and clarification
                 display_processing_message()
                 
                 # First run the clarifier directly
-                clarification_result = await Runner.run(
+                clarification = await cached_run(
                     question_clarifier_agent,
                     user_question,
                 )
                 
-                clarification = clarification_result.final_output_as(QuestionClarification)
-                
                 # If clarification needed, ask follow-up questions
                 if clarification.needs_clarification and clarification.follow_up_questions:
                     display_clarification_request(clarification.follow_up_questions)
@@ -75,28 +89,26 @@ async def run_full_pipeline(user_question, buffers=None, input_provider=None):
                     
                     if not additional_info:
                         # Handle empty response
-                        buffers.write("user", "No additional input provided. Proceeding with default assumptions.")
+                        display_status("No additional input provided. Proceeding with default assumptions.")
                         additional_info = "Please continue with default assumptions."
                     else:
                         # Echo the input to the buffer
-                        buffers.write("user", f"User provided: {additional_info}")
+                        display_status(f"User provided: {additional_info}")
                     
                     # Run clarifier again with the additional information
-                    clarification_result = await Runner.run(
+                    clarification = await cached_run(
                         question_clarifier_agent,
                         f"Original question: {user_question}\nAdditional information: {additional_info}",
                     )
-                    clarification = clarification_result.final_output_as(QuestionClarification)
                 
                 # Use the clarified question for parameter estimation
                 final_question = clarification.clarified_question
 
                 # Add explicit validation of the clarified question before proceeding
-                validation_result = await Runner.run(
-                    question_validator_agent, 
+                validation = await cached_run(
+                    question_validator_agent,
                     final_question,
                 )
-                validation = validation_result.final_output_as(ForecastabilityCheck)
 
                 if not validation.is_forecastable:
                     raise InputGuardrailTripwireTriggered(
@@ -106,46 +118,61 @@ async def run_full_pipeline(user_question, buffers=None, input_provider=None):
                 # Continue with the forecast process
                 display_forecasting_question(final_question)
                 
+                # A repeat of a recently forecast question reuses the earlier result
+                cached_forecast = get_cached_forecast(final_question, current_date)
+                if cached_forecast is not None:
+                    final_forecast, red_team_output = cached_forecast
+                    display_status("This question was forecast recently - showing the cached result.")
+                    display_final_forecast(final_forecast)
+                    display_red_team_challenge(red_team_output)
+                    display_status(
+                        "\n✓ Forecast completed!",
+                        "Use /clearcache (or the 'Clear Cache' button) to run a fresh forecast.",
+                    )
+                    return final_forecast
+                
                 # Start the background info collection in parallel with reference class search
                 display_reference_search_message()
                 
-                # Get current date for background info agent
-                current_date = datetime.datetime.now().strftime("%Y-%m-%d")
-                background_info_task = asyncio.create_task(Runner.run(
+                background_info_task = asyncio.create_task(cached_run(
                     background_info_agent,
                     f"Provide background information as of {current_date} relevant to the question: {final_question}",
+                    display_agent_progress,
                 ))
                 
-                # Wait for background info first since it provides context for reference class selection
-                background_info_result = await background_info_task
-                background_info = background_info_result.final_output_as(BackgroundInfoOutput)
-                
-                # Display background info
-                display_background_info(background_info)
-                
-                # Now search for reference classes with background context
+                # Reference class search only needs the question and the date, so it
+                # runs concurrently with background info instead of waiting on it
                 reference_class_prompt = f"""
                 Find appropriate reference classes for the following question:
                 {final_question}
                 
-                Current world context:
-                {background_info.summary}
-                
-                Recent major events:
-                {', '.join(background_info.major_recent_events[:3])}
-                
-                Key ongoing trends:
-                {', '.join(background_info.key_trends[:3])}
+                Current date: {current_date}
                 """
                 
-                reference_class_task = asyncio.create_task(Runner.run(
+                reference_class_task = asyncio.create_task(cached_run(
                     reference_class_agent,
                     reference_class_prompt,
+                    display_agent_progress,
                 ))
                 
+                # Display background info as soon as it is ready; if it fails, don't
+                # leave the concurrent reference class search running unobserved
+                try:
+                    background_info = await background_info_task
+                except BaseException:
+                    reference_class_task.cancel()
+                    raise
+                display_background_info(background_info)
+                
+                # World context block shared by the parameter design and research prompts
+                world_context = (
+                    f"Current world context:\n{background_info.summary}\n\n"
+                    f"Recent major events:\n{', '.join(background_info.major_recent_events[:3])}\n\n"
+                    f"Key ongoing trends:\n{', '.join(background_info.key_trends[:3])}"
+                )
+                
                 # Wait for reference class results
-                reference_class_result = await reference_class_task
-                reference_class_output = reference_class_result.final_output_as(ReferenceClassOutput)
+                reference_class_output = await reference_class_task
                 
                 # Display all three reference classes
                 display_reference_classes(reference_class_output)
@@ -158,27 +185,19 @@ async def run_full_pipeline(user_question, buffers=None, input_provider=None):
                 parameter_design_prompt = f"""
                 Design parameters for the forecasting question: {final_question}
                 
-                Current world context:
-                {background_info.summary}
-                
-                Recent major events:
-                {', '.join(background_info.major_recent_events[:3])}
-                
-                Key ongoing trends:
-                {', '.join(background_info.key_trends[:3])}
+                {world_context}
                 
                 Reference class: {recommended_ref_class.reference_class_description}
                 Base rate: {recommended_ref_class.base_rate} [{recommended_ref_class.low} - {recommended_ref_class.high}]
                 """
                 
-                parameter_design_task = asyncio.create_task(Runner.run(
+                parameter_design = await run_with_escalation(
                     parameter_design_agent,
+                    parameter_design_agent_large,
                     parameter_design_prompt,
-                ))
-                
-                # Process parameters while background info continues to gather
-                parameter_design_result = await parameter_design_task
-                parameter_design = parameter_design_result.final_output_as(ForecastParameters)
+                    is_parameter_design_acceptable,
+                    display_agent_progress,
+                )
                 
                 # Now research each parameter in parallel
                 display_parameter_research_message()
@@ -186,54 +205,104 @@ async def run_full_pipeline(user_question, buffers=None, input_provider=None):
                 # Print the parameters that will be researched
                 display_parameters_to_research(parameter_design.parameters)
                 
+                # Parameter metadata by name, in design order
+                param_meta_by_name = {param.name: param for param in parameter_design.parameters}
+                
                 # Create a summary of all parameters to provide context
-                all_parameters_context = ""
+                parameter_lines = []
                 for i, param in enumerate(parameter_design.parameters, 1):
-                    all_parameters_context += f"{i}. {param.name}: {param.description}\n"
-                    all_parameters_context += f"   Scale: {param.scale_description}\n"
+                    parameter_lines.append(f"{i}. {param.name}: {param.description}")
+                    parameter_lines.append(f"   Scale: {param.scale_description}")
                     if param.interacts_with:
-                        all_parameters_context += f"   Interacts with: {', '.join(param.interacts_with)}\n"
+                        parameter_lines.append(f"   Interacts with: {', '.join(param.interacts_with)}")
                     if param.interaction_description:
-                        all_parameters_context += f"   Interaction: {param.interaction_description}\n"
-                    all_parameters_context += "\n"
+                        parameter_lines.append(f"   Interaction: {param.interaction_description}")
+                    parameter_lines.append("")
+                all_parameters_context = "".join(f"{line}\n" for line in parameter_lines)
+                
+                # Context shared by every per-parameter research prompt
+                research_context = (
+                    f"Question: {final_question}\n\n"
+                    f"{world_context}\n\n"
+                    f"Parameters being researched:\n{all_parameters_context}"
+                )
+                
+                # Cap concurrent researcher calls to stay under provider rate limits
+                research_semaphore = asyncio.Semaphore(MAX_CONCURRENT_RESEARCH)
                 
                 async def research_parameter(param: ParameterMeta) -> ParameterSample:
                     """Run research for a single parameter"""
+                    # Shared context first so every researcher prompt starts with the same prefix
                     param_prompt = f"""
-                    Research the following parameter for the question: {final_question}
-                    
-                    Current world context:
-                    {background_info.summary}
-                    
-                    Recent major events:
-                    {', '.join(background_info.major_recent_events[:3])}
-                    
-                    Key ongoing trends:
-                    {', '.join(background_info.key_trends[:3])}
+                    {research_context}
                     
+                    Research the following parameter:
                     Parameter: {param.name}
                     Description: {param.description}
                     Scale: {param.scale_description}
                     
-                    Other parameters being researched:
-                    {all_parameters_context}
-                    
                     Based on your research, provide an estimate with 90% confidence interval.
                     """
-                    result = await Runner.run(
-                        parameter_researcher_agent,
-                        param_prompt,
-                    )
+                    async with research_semaphore:
+                        sample = await cached_run(
+                            parameter_researcher_agent,
+                            param_prompt,
+                            display_agent_progress,
+                        )
                     
-                    # Convert the researcher's output to a ParameterSample
-                    sample = result.final_output_as(ParameterSample)
                     sample.name = param.name  # Ensure the name matches
                     return sample
                 
-                # Run parameter research in parallel
-                parameter_samples = await asyncio.gather(
-                    *(research_parameter(param) for param in parameter_design.parameters)
-                )
+                async def research_all_parameters() -> List[ParameterSample]:
+                    """Run research for every parameter in a single batched call"""
+                    batch_prompt = f"""
+                    Research each of the following parameters for the question: {final_question}
+                    
+                    {world_context}
+                    
+                    Parameters to research (return one sample per parameter, in this order):
+                    {all_parameters_context}
+                    
+                    Based on your research, provide an estimate with 90% confidence interval for each parameter.
+                    """
+                    batch = await cached_run(
+                        batch_parameter_researcher_agent,
+                        batch_prompt,
+                        display_agent_progress,
+                    )
+                    if len(batch.samples) != len(parameter_design.parameters):
+                        raise ValueError(
+                            f"Expected {len(parameter_design.parameters)} parameter samples, got {len(batch.samples)}"
+                        )
+                    
+                    # Match samples to parameters by name when the model kept the names,
+                    # otherwise fall back to the requested order
+                    samples_by_name = {sample.name: sample for sample in batch.samples}
+                    if samples_by_name.keys() == param_meta_by_name.keys():
+                        return [samples_by_name[name] for name in param_meta_by_name]
+                    
+                    for sample, param in zip(batch.samples, parameter_design.parameters):
+                        sample.name = param.name
+                    return batch.samples
+                
+                try:
+                    parameter_samples = await research_all_parameters()
+                except (AgentsException, ValueError):
+                    # Fall back to researching each parameter in parallel, reporting each
+                    # one as it finishes rather than waiting silently on the slowest
+                    display_research_fallback_message()
+                    research_tasks = [asyncio.create_task(research_parameter(param))
+                                      for param in parameter_design.parameters]
+                    try:
+                        for completed, next_sample in enumerate(asyncio.as_completed(research_tasks), 1):
+                            sample = await next_sample
+                            display_parameter_researched(sample.name, completed, len(research_tasks))
+                    except BaseException:
+                        for task in research_tasks:
+                            task.cancel()
+                        raise
+                    # Keep the samples in parameter design order for display and the prompts
+                    parameter_samples = [task.result() for task in research_tasks]
                 
                 # Print interim results from the parameter research
                 display_parameter_estimates(parameter_samples)
@@ -241,14 +310,19 @@ async def run_full_pipeline(user_question, buffers=None, input_provider=None):
                 # Synthesize the final forecast
                 display_synthesis_message()
                 
+                # Serialize the parameter estimates once (compactly) for the synthesis and red team prompts
+                parameter_samples_json = orjson.dumps(
+                    [sample.model_dump() for sample in parameter_samples]
+                ).decode()
+                
                 # Create the reference classes information for the synthesis prompt
-                reference_classes_info = ""
-                for i, ref_class in enumerate(reference_class_output.reference_classes):
-                    is_recommended = i == reference_class_output.recommended_class_index
-                    reference_classes_info += f"Reference Class {i+1}{' (RECOMMENDED)' if is_recommended else ''}:\n"
-                    reference_classes_info += f"- Description: {ref_class.reference_class_description}\n"
-                    reference_classes_info += f"- Base rate: {ref_class.base_rate} [{ref_class.low} - {ref_class.high}]\n"
-                    reference_classes_info += f"- Sample size: {ref_class.sample_size}\n\n"
+                reference_classes_info = "".join(
+                    f"Reference Class {i+1}{' (RECOMMENDED)' if i == reference_class_output.recommended_class_index else ''}:\n"
+                    f"- Description: {ref_class.reference_class_description}\n"
+                    f"- Base rate: {ref_class.base_rate} [{ref_class.low} - {ref_class.high}]\n"
+                    f"- Sample size: {ref_class.sample_size}\n\n"
+                    for i, ref_class in enumerate(reference_class_output.reference_classes)
+                )
                 
                 synthesis_prompt = f"""
                 Create a final forecast for: {final_question}
@@ -264,7 +338,7 @@ async def run_full_pipeline(user_question, buffers=None, input_provider=None):
                 Base rate from primary reference class: {recommended_ref_class.base_rate} [{recommended_ref_class.low} - {recommended_ref_class.high}]
                 
                 Parameter estimates:
-                {json.dumps([sample.model_dump() for sample in parameter_samples], indent=2)}
+                {parameter_samples_json}
                 
                 Synthesize these into a final probability estimate. You may consider insights from all reference classes,
                 but primarily use the recommended one as your starting point.
@@ -276,36 +350,17 @@ async def run_full_pipeline(user_question, buffers=None, input_provider=None):
                 4. Provide a 90% confidence interval and rationale
                 """
                 
-                synthesis_task = asyncio.create_task(Runner.run(
+                synthesis_task = asyncio.create_task(cached_run(
                     synthesis_agent,
                     synthesis_prompt,
+                    display_agent_progress,
                 ))
                 
                 # Get the final forecast
-                synthesis_result = await synthesis_task
-                final_forecast = synthesis_result.final_output_as(FinalForecast)
-                
-                # Display the final forecast
-                display_final_forecast(final_forecast)
-                
-                # Record parameter contributions for log-odds details
-                parameter_contributions = {sample.name: sample.delta_log_odds for sample in parameter_samples if sample.delta_log_odds is not None}
-                
-                # Calculate the final log-odds for display
-                base_log_odds = logit(recommended_ref_class.base_rate)
-                final_log_odds = base_log_odds + sum(parameter_contributions.values())
-                
-                # Display the log-odds calculation details
-                display_parameter_calculation(
-                    recommended_ref_class.base_rate,
-                    parameter_contributions,
-                    final_log_odds,
-                    final_forecast.final_estimate
-                )
-                
-                # Now run the red team challenge
-                display_red_team_message()
+                final_forecast = await synthesis_task
                 
+                # Start the red team challenge right away; it only needs the synthesis
+                # output, so the log-odds details below are computed while it runs
                 red_team_prompt = f"""
                 Challenge the following forecast with the strongest possible counterarguments.
                 
@@ -316,7 +371,7 @@ async def run_full_pipeline(user_question, buffers=None, input_provider=None):
                 Rationale: {final_forecast.rationale}
                 
                 Parameter insights:
-                {json.dumps([sample.model_dump() for sample in parameter_samples], indent=2)}
+                {parameter_samples_json}
                 
                 Primary reference class:
                 {recommended_ref_class.reference_class_description} with base rate {recommended_ref_class.base_rate}
@@ -328,21 +383,59 @@ async def run_full_pipeline(user_question, buffers=None, input_provider=None):
                 4. Provide your rationale for the alternative view
                 """
                 
-                red_team_task = asyncio.create_task(Runner.run(
+                red_team_task = asyncio.create_task(run_with_escalation(
                     red_team_agent,
+                    red_team_agent_large,
                     red_team_prompt,
+                    is_red_team_acceptable,
+                    display_agent_progress,
                 ))
                 
+                # Don't leave the red team call running unobserved if anything below fails
+                try:
+                    # Yield once so the task can start running before the synchronous display work
+                    # (this doesn't guarantee its request is already on the wire)
+                    await asyncio.sleep(0)
+                    
+                    # Display the final forecast
+                    display_final_forecast(final_forecast)
+                    
+                    # Record parameter contributions for log-odds details
+                    scored_samples = [sample for sample in parameter_samples if sample.delta_log_odds is not None]
+                    deltas = np.fromiter((sample.delta_log_odds for sample in scored_samples),
+                                         dtype=np.float64, count=len(scored_samples))
+                    parameter_contributions = dict(zip((sample.name for sample in scored_samples), deltas.tolist()))
+                    
+                    # Calculate the final log-odds for display
+                    base_log_odds = logit(recommended_ref_class.base_rate)
+                    final_log_odds = float(base_log_odds + deltas.sum())
+                    
+                    # Display the log-odds calculation details
+                    display_parameter_calculation(
+                        recommended_ref_class.base_rate,
+                        parameter_contributions,
+                        final_log_odds,
+                        final_forecast.final_estimate
+                    )
+                    
+                    # Now show the red team challenge
+                    display_red_team_message()
+                except BaseException:
+                    red_team_task.cancel()
+                    raise
+                
                 # Get the red team challenge
-                red_team_result = await red_team_task
-                red_team_output = red_team_result.final_output_as(RedTeamOutput)
+                red_team_output = await red_team_task
                 
                 # Display the red team challenge
                 display_red_team_challenge(red_team_output)
+                cache_forecast(final_question, current_date, final_forecast, red_team_output)
                 
                 # Add completion message to user buffer
-                buffers.write("user", "\n✓ Forecast completed!")
-                buffers.write("user", "To run another forecast, use the 'Run New Forecast' button or type /rerun in CLI mode.")
+                display_status(
+                    "\n✓ Forecast completed!",
+                    "To run another forecast, use the 'Run New Forecast' button or type /rerun in CLI mode.",
+                )
                 
                 # Save this run
                 question_slug = final_question.lower()[:30].replace(" ", "_").replace("?", "").replace(",", "")
@@ -355,19 +448,19 @@ async def run_full_pipeline(user_question, buffers=None, input_provider=None):
                 display_forecasting_error(e.message)
                 
                 # Ask if user wants to try again
-                buffers.write("user", "\nWould you like to try again with a reformulated question? (yes/no): ")
+                display_status("\nWould you like to try again with a reformulated question? (yes/no): ")
                 retry_response = input_provider.get_input("")
                 
                 if retry_response.lower() not in ["yes", "y"]:
                     # User doesn't want to retry
-                    buffers.write("user", "Forecast canceled.")
+                    display_status("Forecast canceled.")
                     return None
                 
                 # User wants to retry - ask for a new question
-                buffers.write("user", "\nPlease enter a reformulated question: ")
+                display_status("\nPlease enter a reformulated question: ")
                 user_question = input_provider.get_input("")
                 
                 # If user provides empty input, exit
                 if not user_question:
-                    buffers.write("user", "No question provided. Forecast canceled.")
+                    display_status("No question provided. Forecast canceled.")
                     return None
\ No newline at end of file
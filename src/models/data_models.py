@@ -27,6 +27,10 @@ class ParameterSample(BaseModel):
     low: float = Field(description="Lower bound of 90% confidence interval")
     high: float = Field(description="Upper bound of 90% confidence interval")
 
+class ParameterSampleBatch(BaseModel):
+    """Estimates for several parameters researched in a single call"""
+    samples: List[ParameterSample] = Field(description="One sample per requested parameter, in the order the parameters were given")
+
 class ReferenceClass(BaseModel):
     """Output format for a single reference class"""
     reference_class_description: str = Field(description="Description of the reference class used")
@@ -1,15 +1,36 @@
 from src.models import (BackgroundInfoOutput, ReferenceClassOutput, 
                  ParameterMeta, ParameterSample, FinalForecast, RedTeamOutput)
+import functools
+import sys
 from typing import List
+import numpy as np
 from src.utils.forecast_math import logit, inv_logit
 from src.utils.buffers import BufferManager
 
 buffers: BufferManager | None = None
 
+# Evidence strength bands for |delta log-odds| (a shift of exactly 1.0 still counts as "strong")
+STRENGTH_BINS = np.array([0.2, 0.4, 0.7, np.nextafter(1.0, np.inf)])
+STRENGTH_LABELS = ("very weak", "weak", "moderate", "strong", "very strong")
+
+def flushes_console(display_func):
+    """
+    Flush echoed console output once when a display function returns, so its
+    lines reach the terminal in one write even when stdout isn't line-buffered.
+    """
+    @functools.wraps(display_func)
+    def wrapper(*args, **kwargs):
+        try:
+            return display_func(*args, **kwargs)
+        finally:
+            sys.stdout.flush()
+    return wrapper
+
 def init_buffers(bm: BufferManager):
     global buffers
     buffers = bm
 
+@flushes_console
 def display_welcome():
     """Display welcome message."""
     buffers.write("user", "Welcome to the AI Superforecaster")
@@ -19,10 +40,17 @@ def display_welcome():
     buffers.write("user", "- What is the probability that SpaceX will launch humans to Mars before 2030?")
     buffers.write("user", "Please provide your forecasting question following this format.")
 
+@flushes_console
+def display_status(*lines: str):
+    """Display one or more status lines in the user section, as a single entry."""
+    buffers.write_many("user", list(lines))
+
+@flushes_console
 def display_processing_message():
     """Display processing message."""
     buffers.write("user", "\n=== Processing your question ===")
 
+@flushes_console
 def display_clarification_request(follow_up_questions: List[str]):
     """Display request for clarification with follow-up questions."""
     buffers.write("user", "\nTo better understand your question, I need some clarification:")
@@ -30,27 +58,32 @@ def display_clarification_request(follow_up_questions: List[str]):
         buffers.write("user", f"{i}. {question}")
     buffers.write("user", "\nPlease provide this additional information:")
 
+@flushes_console
 def display_forecasting_question(final_question: str):
     """Display the finalized forecasting question."""
     buffers.write("user", f"\nForecasting question: {final_question}")
 
+@flushes_console
 def display_reference_search_message():
     """Display message about searching for reference classes."""
     buffers.write("user", "\n=== Finding relevant reference class and gathering background info ===")
 
+def display_agent_progress(message: str):
+    """Display a live progress note (e.g. a web search) from a running agent."""
+    buffers.write("background", message)
+
+@flushes_console
 def display_background_info(background_info: BackgroundInfoOutput):
     """Display background information about the current world context."""
     buffers.write("background", "=== Current World Context ===")
     buffers.write("background", f"Current date: {background_info.current_date}")
     buffers.write("background", f"Summary: {background_info.summary}")
-    buffers.write("background", "\nRecent Major Events:")
-    for event in background_info.major_recent_events[:3]:  # Show top 3 events
-        buffers.write("background", f"- {event}")
-    buffers.write("background", "\nKey Ongoing Trends:")
-    for trend in background_info.key_trends[:3]:  # Show top 3 trends
-        buffers.write("background", f"- {trend}")
+    # Each list goes out as one message rather than one write per item (top 3 of each)
+    buffers.write_many("background", ["\nRecent Major Events:"] + [f"- {event}" for event in background_info.major_recent_events[:3]])
+    buffers.write_many("background", ["\nKey Ongoing Trends:"] + [f"- {trend}" for trend in background_info.key_trends[:3]])
     buffers.write("user", "✓ Background information collected.")
 
+@flushes_console
 def display_reference_classes(reference_output: ReferenceClassOutput):
     """Display information about reference classes."""
     buffers.write("background", "=== REFERENCE CLASSES ===")
@@ -66,39 +99,51 @@ def display_reference_classes(reference_output: ReferenceClassOutput):
     buffers.write("background", f"\nRecommendation reasoning: {reference_output.selection_reasoning}")
     buffers.write("user", "✓ Reference classes identified.")
 
+@flushes_console
 def display_parameter_design_message():
     """Display message about designing parameters."""
     buffers.write("user", "\n=== Designing key parameters ===")
 
+@flushes_console
 def display_parameter_research_message():
     """Display message about researching parameters."""
     buffers.write("user", "\n=== Researching parameters (this may take a moment) ===")
 
+@flushes_console
+def display_research_fallback_message():
+    """Display message about falling back to per-parameter research."""
+    buffers.write("user", "Batched parameter research was incomplete, researching parameters individually...")
+
+@flushes_console
+def display_parameter_researched(name: str, completed: int, total: int):
+    """Display that one parameter's research finished."""
+    buffers.write("user", f"✓ Researched {name} ({completed}/{total})")
+
 def display_parameters_to_research(parameters: List[ParameterMeta]):
     """Display the parameters that will be researched."""
-    buffers.write("background", "Parameters to research:")
+    # One message for the whole list rather than two writes per parameter
+    lines = ["Parameters to research:"]
     for i, param in enumerate(parameters, 1):
-        buffers.write("background", f"{i}. {param.name}: {param.description}")
-        buffers.write("background", f"   Scale: {param.scale_description}")
+        lines.append(f"{i}. {param.name}: {param.description}")
+        lines.append(f"   Scale: {param.scale_description}")
+    buffers.write_many("background", lines)
 
+@flushes_console
 def display_parameter_estimates(samples: List[ParameterSample]):
     """Display the parameter estimates."""
     buffers.write("background", "=== Parameter estimates ===")
-    for sample in samples:
+    
+    # Classify every parameter's evidence strength in one pass
+    strength_indices = np.digitize(
+        np.abs([sample.delta_log_odds or 0.0 for sample in samples]), STRENGTH_BINS
+    )
+    
+    for sample, strength_index in zip(samples, strength_indices):
         # Display parameter values in parameters section
         buffers.write("parameters", f"{sample.name}: {sample.value} [{sample.low} - {sample.high}]")
         if sample.delta_log_odds is not None:
             sign = "+" if sample.delta_log_odds > 0 else ""
-            if abs(sample.delta_log_odds) < 0.2:
-                strength = "very weak"
-            elif abs(sample.delta_log_odds) < 0.4:
-                strength = "weak"
-            elif abs(sample.delta_log_odds) < 0.7:
-                strength = "moderate"
-            elif abs(sample.delta_log_odds) <= 1.0:
-                strength = "strong"
-            else:
-                strength = "very strong"
+            strength = STRENGTH_LABELS[strength_index]
             buffers.write("parameters", f"  Log-odds: {sign}{sample.delta_log_odds:.3f} ({strength} {'positive' if sample.delta_log_odds > 0 else 'negative'} evidence)")
         
         # Keep parameter definition in background section
@@ -107,10 +152,12 @@ def display_parameter_estimates(samples: List[ParameterSample]):
     
     buffers.write("user", "✓ Parameter research completed.")
 
+@flushes_console
 def display_synthesis_message():
     """Display message about creating the final forecast."""
     buffers.write("user", "\n=== Creating final forecast ===")
 
+@flushes_console
 def display_final_forecast(forecast: FinalForecast):
     """Display the final forecast."""
     buffers.write("report", "=== FINAL FORECAST ===")
@@ -121,10 +168,12 @@ def display_final_forecast(forecast: FinalForecast):
     buffers.write("report", f"Rationale: {forecast.rationale}\n")
     buffers.write("user", f"✓ Final forecast: {forecast.final_estimate*100:.1f}% [{forecast.final_low*100:.1f}% - {forecast.final_high*100:.1f}%]")
 
+@flushes_console
 def display_red_team_message():
     """Display message about running red team challenge."""
     buffers.write("user", "\n=== Running red team challenge ===")
 
+@flushes_console
 def display_red_team_challenge(red_team: RedTeamOutput):
     """Display the red team challenge."""
     buffers.write("report", "=== RED TEAM CHALLENGE ===")
@@ -134,6 +183,7 @@ def display_red_team_challenge(red_team: RedTeamOutput):
     buffers.write("report", f"Rationale: {red_team.rationale}")
     buffers.write("user", "✓ Red team analysis completed.")
 
+@flushes_console
 def display_forecasting_error(reasoning: str):
     """Display error message when a question cannot be forecasted."""
     buffers.write("user", "\n=== CANNOT PROCESS THIS QUESTION ===")
@@ -145,6 +195,7 @@ def display_forecasting_error(reasoning: str):
     buffers.write("user", "- What is the probability that renewable energy will provide >50% of global electricity by 2035?")
     buffers.write("user", "\nYou'll be given a chance to reformulate your question.")
 
+@flushes_console
 def display_parameter_calculation(base_rate, parameter_contributions, final_log_odds, final_prob, 
                                 adjustment_factor=None, conservatism_applied=False):
     """Display the parameter calculation details."""
@@ -155,21 +206,26 @@ def display_parameter_calculation(base_rate, parameter_contributions, final_log_
     
     # Show each parameter's contribution, sorted by magnitude
     buffers.write("parameters", "\nParameter contributions:")
-    total_shift = 0
-    running_log_odds = L_base
-    running_prob = base_rate
+    names = list(parameter_contributions)
+    deltas = np.fromiter(parameter_contributions.values(), dtype=np.float64,
+                         count=len(parameter_contributions))
+    
+    # Sort by magnitude (largest first, ties keep their order) with abs computed once
+    magnitudes = np.abs(deltas)
+    order = np.argsort(-magnitudes, kind="stable")
+    names = [names[i] for i in order]
+    deltas = deltas[order]
+    
+    # Probability before and after each contribution, converted from cumulative log-odds in one pass
+    probs = np.concatenate(([base_rate], inv_logit(L_base + np.cumsum(deltas))))
+    prob_deltas = np.diff(probs) * 100
     
-    for name, delta in sorted(parameter_contributions.items(), key=lambda x: abs(x[1]), reverse=True):
+    for name, delta, running_prob, new_prob, prob_delta in zip(names, deltas, probs[:-1], probs[1:], prob_deltas):
         sign = "+" if delta > 0 else ""
         buffers.write("parameters", f"  {name}: {sign}{delta:.3f}")
         
-        # Calculate the probability impact
-        running_log_odds += delta
-        new_prob = inv_logit(running_log_odds)
-        prob_delta = (new_prob - running_prob) * 100
+        # Show the probability impact
         buffers.write("parameters", f"    Probability shift: {running_prob*100:.1f}% → {new_prob*100:.1f}% ({'+' if prob_delta > 0 else ''}{prob_delta:.1f}%)")
-        running_prob = new_prob
-        total_shift += abs(delta)
     
     # Show any calibration adjustments
     if adjustment_factor and adjustment_factor < 1.0:
@@ -181,6 +237,7 @@ def display_parameter_calculation(base_rate, parameter_contributions, final_log_
     buffers.write("parameters", f"\nFinal log-odds: {final_log_odds:.3f} → Probability: {final_prob*100:.1f}%")
     
     # Interpret the total shift
+    total_shift = float(magnitudes.sum())
     buffers.write("parameters", f"\nTotal log-odds impact: {total_shift:.2f}")
     if total_shift < 1.0:
         buffers.write("parameters", "✓ Conservative shift - typical of careful superforecasters")
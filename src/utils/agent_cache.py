@@ -0,0 +1,162 @@
+"""
+Agent Output Cache for AI Superforecaster
+
+Caches the structured output of agent runs keyed by agent and prompt, so
+identical requests (re-running the same question, repeated validation or
+clarification of the same text) skip the LLM round trip entirely.
+
+The cache lives in memory, entries expire after CACHE_TTL_SECONDS so
+long-running processes pick up fresh research, and it can be disabled
+(e.g. with the --no-cache command line flag) for fresh runs.
+
+Completed forecasts are cached separately, keyed by the normalized final
+question and the current month, so asking the same question again (even
+with different casing, spacing or punctuation) skips the whole pipeline.
+"""
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from agents import Agent, Runner
+
+# Maximum number of agent outputs kept before evicting the least recently used
+MAX_CACHE_ENTRIES = 256
+
+# Seconds an agent output stays valid (prompts embed the current date as well)
+CACHE_TTL_SECONDS = 3600
+
+# Seconds a completed forecast stays valid before the pipeline runs again
+FORECAST_TTL_SECONDS = 7 * 24 * 3600
+
+_cache: "OrderedDict[str, Any]" = OrderedDict()
+_forecast_cache: "OrderedDict[str, Any]" = OrderedDict()
+_enabled = True
+
+def set_cache_enabled(enabled: bool) -> None:
+    """Enable or disable agent output caching."""
+    global _enabled
+    _enabled = enabled
+
+def clear_cache() -> None:
+    """Remove all cached agent outputs and forecasts."""
+    _cache.clear()
+    _forecast_cache.clear()
+
+def _cache_key(agent: Agent, prompt: str) -> str:
+    """Build a content-addressed key for an agent run."""
+    return hashlib.blake2b(f"{agent.name}|{agent.model}|{prompt}".encode()).hexdigest()
+
+def _copy_output(output: Any) -> Any:
+    """Return a copy so callers can mutate outputs without touching the cache."""
+    return output.model_copy(deep=True) if hasattr(output, "model_copy") else output
+
+async def _run_agent(agent: Agent, prompt: str, on_progress: Optional[Callable[[str], None]]) -> Any:
+    """
+    Run an agent, streaming progress events to on_progress if provided.
+
+    Structured outputs only become meaningful once complete, so instead of raw
+    token deltas the callback receives a short note for each tool call as it
+    happens (e.g. every web search) and one when the agent starts writing its
+    answer.
+    """
+    output_type = agent.output_type or str
+    if on_progress is None:
+        result = await Runner.run(agent, prompt)
+        return result.final_output_as(output_type)
+
+    result = Runner.run_streamed(agent, prompt)
+    writing = False
+    async for event in result.stream_events():
+        if event.type == "raw_response_event":
+            if not writing and getattr(event.data, "type", None) == "response.output_text.delta":
+                writing = True
+                on_progress(f"[{agent.name}] writing response...")
+        elif event.type == "run_item_stream_event" and event.item.type == "tool_call_item":
+            writing = False
+            tool_name = getattr(event.item.raw_item, "type", "tool").replace("_call", "").replace("_", " ")
+            on_progress(f"[{agent.name}] {tool_name}...")
+    return result.final_output_as(output_type)
+
+async def cached_run(agent: Agent, prompt: str, on_progress: Optional[Callable[[str], None]] = None) -> Any:
+    """
+    Run an agent and return its final output as the agent's output type.
+
+    Args:
+        agent: The agent to run
+        prompt: Input text for the agent
+        on_progress: Optional callback receiving progress messages while the agent runs
+    """
+    if not _enabled:
+        return await _run_agent(agent, prompt, on_progress)
+
+    key = _cache_key(agent, prompt)
+    entry = _cache.get(key)
+    if entry is not None:
+        stored_at, cached_output = entry
+        if time.monotonic() - stored_at < CACHE_TTL_SECONDS:
+            _cache.move_to_end(key)
+            return _copy_output(cached_output)
+        del _cache[key]
+
+    output = await _run_agent(agent, prompt, on_progress)
+
+    _cache[key] = (time.monotonic(), _copy_output(output))
+    if len(_cache) > MAX_CACHE_ENTRIES:
+        _cache.popitem(last=False)
+    return output
+
+def _forecast_key(question: str, current_date: str) -> str:
+    """Key a forecast by its question's words (ignoring case and punctuation) and month."""
+    words = " ".join(re.findall(r"\w+", question.casefold()))
+    return f"{current_date[:7]}|{words}"
+
+def get_cached_forecast(question: str, current_date: str) -> Optional[tuple]:
+    """
+    Return the cached (final forecast, red team output) for a question, if fresh.
+
+    Args:
+        question: The final (clarified) forecasting question
+        current_date: The run's date as YYYY-MM-DD
+    """
+    if not _enabled:
+        return None
+    key = _forecast_key(question, current_date)
+    entry = _forecast_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, outputs = entry
+    if time.monotonic() - stored_at >= FORECAST_TTL_SECONDS:
+        del _forecast_cache[key]
+        return None
+    _forecast_cache.move_to_end(key)
+    return tuple(_copy_output(output) for output in outputs)
+
+def cache_forecast(question: str, current_date: str, final_forecast: Any, red_team_output: Any) -> None:
+    """Store a completed forecast so repeats of the question skip the pipeline."""
+    if not _enabled:
+        return
+    _forecast_cache[_forecast_key(question, current_date)] = (
+        time.monotonic(), (_copy_output(final_forecast), _copy_output(red_team_output))
+    )
+    if len(_forecast_cache) > MAX_CACHE_ENTRIES:
+        _forecast_cache.popitem(last=False)
+
+async def run_with_escalation(agent: Agent, fallback_agent: Agent, prompt: str,
+                              is_acceptable: Callable[[Any], bool],
+                              on_progress: Optional[Callable[[str], None]] = None) -> Any:
+    """
+    Run a (cheaper) agent and retry with a fallback agent if its output is rejected.
+
+    Args:
+        agent: The agent to try first, typically on a small model
+        fallback_agent: The agent to use when is_acceptable rejects the first output
+        prompt: Input text for the agents
+        is_acceptable: Quality gate applied to the first agent's output
+        on_progress: Optional callback receiving progress messages while the agents run
+    """
+    output = await cached_run(agent, prompt, on_progress)
+    if is_acceptable(output):
+        return output
+    return await cached_run(fallback_agent, prompt, on_progress)
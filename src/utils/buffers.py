@@ -19,6 +19,9 @@ class TextBuffer:
     """A single text buffer that accumulates timestamped entries."""
     def __init__(self) -> None:
         self.entries: List[Dict[str, Any]] = []
+        # Text of the first _dumped_count entries, extended on the next dump
+        self._dumped_text = ""
+        self._dumped_count = 0
 
     def write(self, content: str, content_type: str = "text") -> None:
         """Add a timestamped entry to the buffer."""
@@ -30,9 +33,26 @@ class TextBuffer:
         })
 
     def dump(self) -> str:
-        """Get the entire buffer contents as a string."""
-        return "\n".join([f"[{entry['timestamp']}] {entry['content']}" 
-                         for entry in self.entries])
+        """
+        Get the entire buffer contents as a string.
+        Entries are append-only, so only entries added since the last dump are formatted.
+        """
+        if self._dumped_count < len(self.entries):
+            new_text = "\n".join(self.lines_from(self._dumped_count))
+            self._dumped_text = f"{self._dumped_text}\n{new_text}" if self._dumped_count else new_text
+            self._dumped_count = len(self.entries)
+        return self._dumped_text
+
+    def lines_from(self, start: int) -> List[str]:
+        """Get formatted entries from index start onwards."""
+        return [f"[{entry['timestamp']}] {entry['content']}" 
+                for entry in self.entries[start:]]
+
+    def reset(self) -> None:
+        """Remove all entries so the buffer can be reused."""
+        self.entries.clear()
+        self._dumped_text = ""
+        self._dumped_count = 0
 
 class BufferManager:
     """
@@ -57,6 +77,8 @@ class BufferManager:
         self._bufs: Dict[str, TextBuffer] = defaultdict(TextBuffer)
         self.echo_user = echo_user
         self.observers: List[Callable[[str, str, str, str], None]] = []
+        # Incremented on every write so callers can cheaply detect changes
+        self.version = 0
         
         # Initialize requested buffers or defaults
         if buffer_names is None:
@@ -81,9 +103,17 @@ class BufferManager:
         # Wrap the callback to handle the new signature with content_type
         def wrapped_callback(section, message, timestamp, content_type=None):
             callback(section, message, timestamp)
+        wrapped_callback.callback = callback
             
         self.observers.append(wrapped_callback)
 
+    def unregister_observer(self, callback: Callable[[str, str, str], None]) -> None:
+        """Stop calling a function registered with register_observer."""
+        self.observers = [
+            observer for observer in self.observers
+            if getattr(observer, "callback", None) != callback
+        ]
+
     def write(self, section: str, content: Union[str, Any], content_type: str = "text") -> None:
         """
         Write content to a named buffer section.
@@ -115,6 +145,7 @@ class BufferManager:
         
         # Add entry to buffer
         buf.write(content, content_type)
+        self.version += 1
         
         # Notify observers
         for observer in self.observers:
@@ -122,10 +153,41 @@ class BufferManager:
             display_text = display_content if isinstance(display_content, str) else str(display_content)
             observer(section, display_text, ts, content_type)
 
+    def write_many(self, section: str, lines: List[str]) -> None:
+        """
+        Write several lines to a buffer section as a single entry.
+        
+        Consecutive status lines go out with one console echo and one observer
+        notification instead of one of each per line.
+        
+        Args:
+            section: The buffer section to write to (e.g., "user", "background")
+            lines: Text lines to write, in order
+        """
+        self.write(section, "\n".join(lines))
+
     def dump(self, section: str) -> str:
         """Get the entire contents of a buffer section."""
         return self._bufs[section].dump()
 
+    def lines_from(self, section: str, start: int) -> List[str]:
+        """Get the lines of a buffer section written after the first start entries."""
+        return self._bufs[section].lines_from(start)
+
+    def entries(self, section: str) -> List[Dict[str, Any]]:
+        """Get a snapshot of a buffer section's entries (content, timestamp and type)."""
+        return list(self._bufs[section].entries)
+
+    def reset(self) -> None:
+        """
+        Clear every buffer section and remove all observers so the manager
+        can be reused for a new forecast.
+        """
+        for buf in self._bufs.values():
+            buf.reset()
+        self.observers.clear()
+        self.version = 0
+
     @property
     def sections(self):
         """Get all active buffer section names."""
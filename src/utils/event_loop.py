@@ -0,0 +1,25 @@
+"""
+Event Loop Selection for AI Superforecaster
+
+Forecasts spend nearly all their time waiting on OpenAI HTTP calls, so the
+event loop's per-callback overhead adds up. uvloop (installed with
+uvicorn[standard], unavailable on Windows) is used when present and the
+standard asyncio loop otherwise.
+"""
+import asyncio
+from typing import Any, Coroutine
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create a new event loop, using uvloop when it is installed."""
+    return uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+
+def run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine to completion on a fresh event loop (like asyncio.run)."""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
@@ -0,0 +1,64 @@
+"""
+Shared HTTP Client for AI Superforecaster
+
+Every agent run makes several OpenAI requests. Instead of letting each
+request negotiate a fresh TCP+TLS connection, all agents share one pooled
+httpx client with keep-alive (and HTTP/2 when the h2 package is installed).
+
+httpx connections are bound to the event loop that created them, so the
+client is created lazily for the running loop and replaced if the loop
+changes (e.g. a new forecast started with asyncio.run). Code that runs each
+forecast on a throwaway loop should close the client before the loop ends.
+"""
+import asyncio
+import importlib.util
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI
+from agents import set_default_openai_client
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Retries (with the OpenAI client's exponential backoff) on 429 and transient errors
+MAX_RETRIES = 5
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _create_client() -> httpx.AsyncClient:
+    """Create a pooled httpx client for OpenAI requests."""
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        timeout=60.0,
+    )
+
+def use_shared_http_client() -> httpx.AsyncClient:
+    """
+    Make all agents reuse one pooled HTTP client on the running event loop.
+
+    Must be called from inside a coroutine. Cheap to call repeatedly: the
+    client is only rebuilt when the event loop has changed.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = _create_client()
+        _client_loop = loop
+        set_default_openai_client(AsyncOpenAI(http_client=_client, max_retries=MAX_RETRIES))
+    return _client
+
+async def close_shared_http_client() -> None:
+    """
+    Close the shared client and its pooled connections.
+
+    Must be called on the loop the client was created for. The next
+    use_shared_http_client call creates a fresh client.
+    """
+    global _client, _client_loop
+    if _client is not None:
+        client = _client
+        _client = None
+        _client_loop = None
+        await client.aclose()
@@ -0,0 +1,111 @@
+import pytest
+from types import SimpleNamespace
+from pydantic import BaseModel
+from src.utils import agent_cache
+from src.utils.agent_cache import (cached_run, clear_cache, set_cache_enabled,
+                                   get_cached_forecast, cache_forecast, _forecast_key)
+
+class Output(BaseModel):
+    value: str
+
+AGENT = SimpleNamespace(name="Test Agent", model="test-model")
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    """Start each test with an empty, enabled cache, a fake clock and a counting agent runner."""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(agent_cache, "time", SimpleNamespace(monotonic=lambda: clock.now))
+
+    calls = []
+    async def fake_run_agent(agent, prompt, on_progress):
+        calls.append(prompt)
+        return Output(value=f"answer to {prompt}")
+    monkeypatch.setattr(agent_cache, "_run_agent", fake_run_agent)
+
+    clear_cache()
+    set_cache_enabled(True)
+    yield SimpleNamespace(clock=clock, calls=calls)
+    clear_cache()
+    set_cache_enabled(True)
+
+@pytest.mark.asyncio
+async def test_cache_hit_and_miss(fresh_cache):
+    """Repeating an agent and prompt reuses the output; a new prompt runs the agent."""
+    first = await cached_run(AGENT, "question one")
+    again = await cached_run(AGENT, "question one")
+    other = await cached_run(AGENT, "question two")
+
+    assert fresh_cache.calls == ["question one", "question two"]
+    assert again.value == first.value
+    assert other.value == "answer to question two"
+
+@pytest.mark.asyncio
+async def test_cache_disabled(fresh_cache):
+    """With caching disabled every call runs the agent."""
+    set_cache_enabled(False)
+    await cached_run(AGENT, "question")
+    await cached_run(AGENT, "question")
+    assert len(fresh_cache.calls) == 2
+
+@pytest.mark.asyncio
+async def test_cache_ttl_expiry(fresh_cache):
+    """Outputs older than CACHE_TTL_SECONDS are fetched again."""
+    await cached_run(AGENT, "question")
+
+    fresh_cache.clock.now += agent_cache.CACHE_TTL_SECONDS - 1
+    await cached_run(AGENT, "question")
+    assert len(fresh_cache.calls) == 1
+
+    fresh_cache.clock.now += 1
+    await cached_run(AGENT, "question")
+    assert len(fresh_cache.calls) == 2
+
+@pytest.mark.asyncio
+async def test_cache_lru_eviction(fresh_cache, monkeypatch):
+    """Past MAX_CACHE_ENTRIES the least recently used output is evicted."""
+    monkeypatch.setattr(agent_cache, "MAX_CACHE_ENTRIES", 2)
+    await cached_run(AGENT, "a")
+    await cached_run(AGENT, "b")
+    await cached_run(AGENT, "a")  # hit, so "b" is now least recently used
+    await cached_run(AGENT, "c")  # evicts "b"
+    assert fresh_cache.calls == ["a", "b", "c"]
+
+    await cached_run(AGENT, "a")
+    await cached_run(AGENT, "b")
+    assert fresh_cache.calls == ["a", "b", "c", "b"]
+
+@pytest.mark.asyncio
+async def test_cache_returns_copies(fresh_cache):
+    """Mutating a returned output doesn't change what the cache returns next."""
+    first = await cached_run(AGENT, "question")
+    first.value = "mutated"
+
+    second = await cached_run(AGENT, "question")
+    assert second is not first
+    assert second.value == "answer to question"
+
+def test_forecast_key_normalization():
+    """Forecast keys ignore case, spacing and punctuation but change with the month."""
+    key = _forecast_key("Will X happen by 2030?", "2026-10-15")
+    assert _forecast_key("  will x HAPPEN, by 2030 ", "2026-10-01") == key
+    assert _forecast_key("Will X happen by 2031?", "2026-10-15") != key
+    assert _forecast_key("Will X happen by 2030?", "2026-11-15") != key
+
+def test_forecast_cache_round_trip_and_expiry(fresh_cache):
+    """Cached forecasts are returned as copies until FORECAST_TTL_SECONDS passes."""
+    forecast, red_team = Output(value="forecast"), Output(value="red team")
+    cache_forecast("Will X happen by 2030?", "2026-10-15", forecast, red_team)
+
+    cached = get_cached_forecast("will x happen by 2030", "2026-10-20")
+    assert [output.value for output in cached] == ["forecast", "red team"]
+    assert cached[0] is not forecast
+
+    fresh_cache.clock.now += agent_cache.FORECAST_TTL_SECONDS
+    assert get_cached_forecast("Will X happen by 2030?", "2026-10-20") is None
+
+def test_forecast_cache_disabled(fresh_cache):
+    """With caching disabled forecasts are neither stored nor returned."""
+    set_cache_enabled(False)
+    cache_forecast("Will X happen by 2030?", "2026-10-15", Output(value="f"), Output(value="r"))
+    set_cache_enabled(True)
+    assert get_cached_forecast("Will X happen by 2030?", "2026-10-15") is None
@@ -1,8 +1,14 @@
 import pytest
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 from fastapi.testclient import TestClient
 import uuid
-from api_server import app, sessions
+import api_server
+from api_server import app, sessions, evict_expired_sessions, SESSION_TTL_SECONDS
+from src.utils.buffers import BufferManager
 import asyncio
 
 client = TestClient(app)
@@ -72,4 +78,142 @@ def test_api_failures():
         data="not a json",
         headers={"Content-Type": "application/json"}
     )
-    assert invalid_response.status_code == 422  # FastAPI validation error 
\ No newline at end of file
+    assert invalid_response.status_code == 422  # FastAPI validation error 
+
+def test_metrics():
+    """Metrics report forecast load."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    data = response.json()
+    for key in ("running", "queued", "max_concurrent", "max_queued", "sessions"):
+        assert key in data
+
+def test_cancel_unknown_session():
+    """Cancelling an unknown session reports not_found."""
+    response = client.delete(f"/forecast/{uuid.uuid4()}")
+    assert response.status_code == 200
+    assert response.json()["status"] == "not_found"
+
+def test_session_eviction():
+    """Finished sessions expire after the TTL; running sessions and unfinished tasks are kept."""
+    now = time.monotonic()
+    stale = now - SESSION_TTL_SECONDS - 1
+    sessions["expired"] = {"status": "completed", "last_touch": stale}
+    sessions["still-running"] = {"status": "running", "last_touch": stale}
+    sessions["fresh"] = {"status": "error", "last_touch": now}
+    # Cancelled, but its task is still waiting for the worker to stop
+    sessions["stopping"] = {"status": "cancelled", "last_touch": stale,
+                            "task": SimpleNamespace(done=lambda: False)}
+    try:
+        assert evict_expired_sessions(now) == 1
+        assert "expired" not in sessions
+        assert "still-running" in sessions
+        assert "fresh" in sessions
+        assert "stopping" in sessions
+    finally:
+        for session_id in ("expired", "still-running", "fresh", "stopping"):
+            sessions.pop(session_id, None)
+
+def test_buffers_not_modified():
+    """Polling with the last ETag returns 304 until the buffers change."""
+    buffer_manager = BufferManager(["user"], echo_user=False)
+    sessions["etag-test"] = {
+        "status": "running",
+        "buffer_manager": buffer_manager,
+        "section_names": ["user"],
+        "last_touch": time.monotonic(),
+    }
+    try:
+        first = client.get("/forecast/etag-test/buffers")
+        etag = first.headers["etag"]
+        
+        unchanged = client.get("/forecast/etag-test/buffers", headers={"If-None-Match": etag})
+        assert unchanged.status_code == 304
+        
+        buffer_manager.write("user", "new line")
+        changed = client.get("/forecast/etag-test/buffers", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+    finally:
+        sessions.pop("etag-test", None)
+
+def test_buffers_not_modified_cross_origin():
+    """The frontend origin may send If-None-Match and read the ETag."""
+    origin = api_server.FRONTEND_ORIGINS[0]
+    preflight = client.options(
+        "/forecast/etag-cors/buffers",
+        headers={
+            "Origin": origin,
+            "Access-Control-Request-Method": "GET",
+            "Access-Control-Request-Headers": "if-none-match",
+        },
+    )
+    assert preflight.status_code == 200
+    assert "if-none-match" in preflight.headers["access-control-allow-headers"].lower()
+    
+    sessions["etag-cors"] = {
+        "status": "running",
+        "buffer_manager": BufferManager(["user"], echo_user=False),
+        "section_names": ["user"],
+        "last_touch": time.monotonic(),
+    }
+    try:
+        first = client.get("/forecast/etag-cors/buffers", headers={"Origin": origin})
+        assert "etag" in first.headers["access-control-expose-headers"].lower()
+        etag = first.headers["etag"]
+        
+        unchanged = client.get("/forecast/etag-cors/buffers",
+                               headers={"Origin": origin, "If-None-Match": etag})
+        assert unchanged.status_code == 304
+        assert unchanged.headers["access-control-allow-origin"] == origin
+    finally:
+        sessions.pop("etag-cors", None)
+
+async def wait_until(condition, timeout=5.0):
+    """Poll condition until it holds, failing the test after timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("Timed out waiting for condition")
+        await asyncio.sleep(0.01)
+
+@pytest.mark.asyncio
+async def test_cancelled_forecast_keeps_slot_until_worker_returns(monkeypatch):
+    """A cancelled forecast holds its slot until its worker has stopped."""
+    stop_requested = threading.Event()
+    worker_may_return = threading.Event()
+    
+    def fake_pipeline_entry(question, line_queue, cancel_event):
+        cancel_event.wait(5)
+        stop_requested.set()
+        line_queue.put(("user", "stopping"))
+        worker_may_return.wait(5)
+        line_queue.put(None)
+        return None
+    
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(api_server, "PIPELINE_POOL", pool)
+    monkeypatch.setattr(api_server, "_pipeline_entry", fake_pipeline_entry)
+    monkeypatch.setattr(api_server, "get_queue_manager",
+                        lambda: SimpleNamespace(Queue=queue.Queue, Event=threading.Event))
+    
+    running = api_server.forecast_counts["running"]
+    buffer_manager = BufferManager(echo_user=False)
+    task = asyncio.create_task(api_server.run_forecast_background("slot-test", "Test?", buffer_manager))
+    try:
+        await wait_until(lambda: api_server.forecast_counts["running"] == running + 1)
+        
+        task.cancel()
+        await wait_until(stop_requested.is_set)
+        # The worker hasn't returned yet, so the slot is still taken
+        assert api_server.forecast_counts["running"] == running + 1
+        
+        worker_may_return.set()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert api_server.forecast_counts["running"] == running
+        # Lines written while the worker stopped were still relayed
+        assert "stopping" in buffer_manager.dump("user")
+    finally:
+        worker_may_return.set()
+        pool.shutdown(wait=True)
@@ -0,0 +1,27 @@
+from src.utils.buffers import BufferManager
+
+def test_incremental_dump():
+    """Dumps include entries written after an earlier dump."""
+    buffer_manager = BufferManager(["user"], echo_user=False)
+    buffer_manager.write("user", "first")
+    assert buffer_manager.dump("user").endswith("] first")
+
+    buffer_manager.write("user", "second")
+    lines = buffer_manager.dump("user").split("\n")
+    assert [line.split("] ", 1)[1] for line in lines] == ["first", "second"]
+
+def test_reset_clears_dumped_text():
+    """A reset (pooled) manager doesn't carry the previous session's output into the next."""
+    buffer_manager = BufferManager(["user"], echo_user=False)
+    buffer_manager.write("user", "old session")
+    buffer_manager.dump("user")
+
+    buffer_manager.reset()
+    assert buffer_manager.dump("user") == ""
+    assert buffer_manager.version == 0
+
+    buffer_manager.write("user", "new session")
+    dumped = buffer_manager.dump("user")
+    assert "old session" not in dumped
+    assert dumped.endswith("] new session")
+    assert "\n" not in dumped